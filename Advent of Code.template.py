@@ -1,9 +1,17 @@
 # Advent of Code
 
 from enum import Enum, auto
+import logging
+import os
 
-# global variable to make functions more chatty for debugging
-verbose = True
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.dayNN")
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
@@ -19,8 +27,8 @@ class InputProvider(Enum):
     TODO: fill in
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
 
 
 def run(inputProvider, part=1, expectedSolution=()):
@@ -43,8 +51,10 @@ def solve(input, part=1) -> int:
     pass
 
 
-# TODO: fill in example solution
-run(InputProvider.EXAMPLE, part=1, expectedSolution=12345)
-# run(InputProvider.INPUTFILE, part=1)
-# run(InputProvider.EXAMPLE, part=2, expectedSolution=)
-# run(InputProvider.INPUTFILE, part=2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.DEBUG)
+    # TODO: fill in example solution
+    run(InputProvider.EXAMPLE, part=1, expectedSolution=12345)
+    # run(InputProvider.INPUTFILE, part=1)
+    # run(InputProvider.EXAMPLE, part=2, expectedSolution=)
+    # run(InputProvider.INPUTFILE, part=2)
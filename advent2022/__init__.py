@@ -0,0 +1,10 @@
+"""Advent of Code 2022, all days in one interpreter.
+
+The day scripts in dayNN/ stay runnable on their own; this package finds
+them, imports them without side effects and runs their solvers together:
+
+    python -m advent2022 run --days 1-11 --parts 1,2
+"""
+
+from advent2022.days import Day, discoverDays
+from advent2022.runner import Result, runDays
@@ -0,0 +1,171 @@
+"""Command line entry point:  python -m advent2022 run --days 1-11"""
+
+import argparse
+import sys
+import time
+
+from advent2022.benchmark import (benchmarkDays, loadBaseline,
+                                  printBenchmarkReport, saveBaseline)
+from advent2022.days import Day, discoverDays
+from advent2022.generators import DEFAULT_SEED, GENERATORS, generate
+from advent2022.runner import printReport, runDays
+from advent2022.tracing import configureLogging
+
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+def parseNumberList(text: str) -> [int]:
+    '''"1-3,7" → [1, 2, 3, 7]'''
+    numbers = list()
+    for piece in text.split(","):
+        first, _, last = piece.partition("-")
+        if last:
+            numbers.extend(range(int(first), int(last) + 1))
+        else:
+            numbers.append(int(first))
+    return numbers
+
+
+def parseInputKinds(text: str) -> [str]:
+    kinds = text.split(",")
+    for kind in kinds:
+        if kind not in ("example", "file"):
+            raise argparse.ArgumentTypeError(
+                "input kinds are 'example' and 'file', not: " + kind)
+    return kinds
+
+
+def parseDayLevel(text: str) -> (int, str):
+    '''"5=DEBUG" → (5, "DEBUG")'''
+    day, _, level = text.partition("=")
+    level = level.upper()
+    if level not in LOG_LEVELS:
+        raise argparse.ArgumentTypeError(
+            "expected DAY=LEVEL with LEVEL one of {0}, not: {1}"
+            .format(", ".join(LOG_LEVELS), text))
+    return (int(day), level)
+
+
+def addTracingArguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--log-level", type=str.upper, choices=LOG_LEVELS,
+                        default="WARNING",
+                        help="tracing level for every day (default: WARNING)")
+    parser.add_argument("--log-day", type=parseDayLevel, action="append",
+                        default=[], metavar="DAY=LEVEL",
+                        help="tracing level for one day, e.g. 5=DEBUG")
+    parser.add_argument("--log-file", metavar="FILE",
+                        help="write traces here, buffered, not to stderr")
+
+
+def addSelectionArguments(parser: argparse.ArgumentParser):
+    '''--days, --parts and --inputs, shared by the subcommands.'''
+    parser.add_argument("--days", type=parseNumberList, default=None,
+                        help="e.g. 1-11 or 1,3,5 (default: every day)")
+    parser.add_argument("--parts", type=parseNumberList, default=[1, 2],
+                        help="1, 2 or 1,2 (default: 1,2)")
+    parser.add_argument("--inputs", type=parseInputKinds,
+                        default=["example", "file"],
+                        help="example, file or example,file "
+                             "(default: example,file)")
+
+
+def makeParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="advent2022")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    runParser = subparsers.add_parser(
+        "run", help="solve the selected days in this one interpreter")
+    addSelectionArguments(runParser)
+    addTracingArguments(runParser)
+    runParser.add_argument("--jobs", "-j", type=int, default=1,
+                           help="solve in this many processes (default: 1)")
+
+    benchParser = subparsers.add_parser(
+        "bench", help="time the selected days over many runs")
+    addSelectionArguments(benchParser)
+    addTracingArguments(benchParser)
+    benchParser.add_argument("--repeat", "-n", type=int, default=10,
+                             help="timed runs of each solver (default: 10)")
+    benchParser.add_argument("--warmup", type=int, default=2,
+                             help="untimed runs first (default: 2)")
+    benchParser.add_argument("--save", metavar="JSON",
+                             help="write the results as a baseline file")
+    benchParser.add_argument("--baseline", metavar="JSON",
+                             help="compare medians against this baseline")
+    benchParser.add_argument("--threshold", type=float, default=0.1,
+                             help="how much slower counts as a regression "
+                                  "(default: 0.1, i.e. 10%%)")
+    benchParser.add_argument("--scales", type=parseNumberList, default=[],
+                             help="also time generated inputs this many "
+                                  "times the real size, e.g. 10,100")
+
+    generateParser = subparsers.add_parser(
+        "generate", help="print a synthetic input for one day")
+    generateParser.add_argument("--day", type=int, required=True,
+                                choices=sorted(GENERATORS))
+    generateParser.add_argument("--scale", type=int, default=10,
+                                help="times the size of input.txt "
+                                     "(default: 10)")
+    generateParser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    generateParser.add_argument("--output", "-o", metavar="FILE",
+                                help="write here instead of stdout")
+    return parser
+
+
+def selectDays(args) -> [Day]:
+    days = discoverDays()
+    if args.days is not None:
+        days = [day for day in days if day.number in args.days]
+    return days
+
+
+def runCommand(args) -> int:
+    loggingArgs = (args.log_level, dict(args.log_day), args.log_file)
+    configureLogging(*loggingArgs)
+    start = time.perf_counter()
+    results = runDays(selectDays(args), args.parts, args.inputs,
+                      jobs=args.jobs, initializer=configureLogging,
+                      initargs=loggingArgs + (True,))
+    printReport(results, time.perf_counter() - start)
+    failed = any(result.finishChar() == "❌" for result in results)
+    return 1 if failed else 0
+
+
+def benchCommand(args) -> int:
+    configureLogging(args.log_level, dict(args.log_day), args.log_file)
+    baseline = None
+    if args.baseline:
+        baseline = loadBaseline(args.baseline)
+    timings = benchmarkDays(selectDays(args), args.parts, args.inputs,
+                            repeat=args.repeat, warmup=args.warmup,
+                            scales=args.scales)
+    regressions = printBenchmarkReport(timings, baseline, args.threshold)
+    if args.save:
+        saveBaseline(timings, args.save)
+    return 1 if regressions > 0 else 0
+
+
+def generateCommand(args) -> int:
+    text = generate(args.day, args.scale, args.seed)
+    if args.output:
+        with open(args.output, mode="wt") as outputFile:
+            outputFile.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+def main(argv=None) -> int:
+    args = makeParser().parse_args(argv)
+    match args.command:
+        case "run":
+            return runCommand(args)
+        case "bench":
+            return benchCommand(args)
+        case "generate":
+            return generateCommand(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Timing each day/part/input many times, and comparing against a baseline.
+
+    python -m advent2022 bench --days 7-8 --repeat 20 --save bench.json
+    python -m advent2022 bench --days 7-8 --repeat 20 --baseline bench.json
+"""
+
+import contextlib
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from advent2022.days import Day
+from advent2022.generators import GENERATORS, generate
+from advent2022.runner import planRuns
+
+
+class Timing:
+    '''Statistics over the repeated runs of one day/part/input.
+times are in seconds, peakBytes is from tracemalloc.'''
+
+    def __init__(self, key: str, times: [float], peakBytes: int):
+        self.key = key
+        self.times = sorted(times)
+        self.peakBytes = peakBytes
+
+    def min(self) -> float:
+        return self.times[0]
+
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    def p95(self) -> float:
+        '''Nearest-rank 95th percentile.'''
+        rank = -(-95 * len(self.times) // 100)    # ceiling division
+        return self.times[max(rank, 1) - 1]
+
+    def toDict(self) -> dict:
+        return {"min": self.min(), "median": self.median(), "p95": self.p95(),
+                "peakBytes": self.peakBytes, "runs": len(self.times)}
+
+
+def benchmarkKey(day: Day, part: int, inputName: str) -> str:
+    return "{0}/part{1}/{2}".format(day, part, inputName)
+
+
+def benchmarkOne(day: Day, part: int, inputName: str, repeat: int = 10,
+                 warmup: int = 2, input: str = None) -> Timing:
+    '''Time the solver repeat times after warmup untimed runs, then once more
+under tracemalloc for the peak memory.  Solver output goes to os.devnull.
+input, when given, is used instead of the day's own inputName.'''
+    if input is None:
+        input = day.getInput(inputName)
+    if isinstance(input, str):
+        getInput = lambda: input
+    else:
+        # a line iterator is used up by one run; mapping is part of the cost
+        getInput = lambda: day.getInput(inputName)
+    solver = day.solverFor(part)
+    times = list()
+    with open(os.devnull, mode="wt") as devnull, \
+         contextlib.redirect_stdout(devnull):
+        for _ in range(warmup):
+            solver(getInput())
+        for _ in range(repeat):
+            runInput = getInput()
+            start = time.perf_counter()
+            solver(runInput)
+            times.append(time.perf_counter() - start)
+        # tracemalloc slows everything down, so it gets a run of its own
+        tracemalloc.start()
+        try:
+            solver(getInput())
+            _, peakBytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return Timing(benchmarkKey(day, part, inputName), times, peakBytes)
+
+
+def benchmarkDays(days: [Day], parts: [int] = (1, 2),
+                  inputKinds: [str] = ("example", "file"), repeat: int = 10,
+                  warmup: int = 2, scales: [int] = ()) -> [Timing]:
+    '''Also times each part on generated inputs at each of scales, named
+"x10", "x100" and so on.  Days that fail to import, and runs that raise,
+are skipped with a note on stdout; the benchmark is about speed, `run` is
+about answers.'''
+    timings = list()
+    for day in days:
+        try:
+            runs = planRuns(day, parts, inputKinds)
+            dayParts = [part for part in parts if part in day.parts()]
+        except Exception as e:
+            print("⏭  {0} skipped: {1!r}".format(day, e))
+            continue
+        generated = list()
+        if day.number in GENERATORS:
+            generated = [("x{0}".format(scale), generate(day.number, scale))
+                         for scale in scales]
+        for part in dayParts:
+            partRuns = [(inputName, None)
+                        for runPart, inputName in runs if runPart == part]
+            for inputName, input in partRuns + generated:
+                try:
+                    timings.append(benchmarkOne(day, part, inputName, repeat,
+                                                warmup, input))
+                except Exception as e:
+                    print("⏭  {0} skipped: {1!r}".format(
+                        benchmarkKey(day, part, inputName), e))
+    return timings
+
+
+def saveBaseline(timings: [Timing], path: str):
+    with open(path, mode="wt") as baselineFile:
+        json.dump({t.key: t.toDict() for t in timings}, baselineFile,
+                  indent=2, sort_keys=True)
+
+
+def loadBaseline(path: str) -> dict:
+    with open(path, mode="rt") as baselineFile:
+        return json.load(baselineFile)
+
+
+def isRegression(timing: Timing, baselineEntry: dict,
+                 threshold: float) -> bool:
+    '''Slower median than the baseline's by more than threshold (0.1 = 10%).'''
+    return timing.median() > baselineEntry["median"] * (1 + threshold)
+
+
+def printBenchmarkReport(timings: [Timing], baseline: dict = None,
+                         threshold: float = 0.1) -> int:
+    '''Prints one line per Timing; returns the number of regressions.'''
+    print("{0:<26} {1:>10} {2:>10} {3:>10} {4:>10}".format(
+        "", "min ms", "median ms", "p95 ms", "peak KiB"))
+    regressions = 0
+    for timing in timings:
+        line = "{0:<26} {1:>10.3f} {2:>10.3f} {3:>10.3f} {4:>10.1f}".format(
+            timing.key, 1000 * timing.min(), 1000 * timing.median(),
+            1000 * timing.p95(), timing.peakBytes / 1024)
+        if baseline is not None:
+            entry = baseline.get(timing.key)
+            if entry is None:
+                line += "   (new)"
+            else:
+                change = timing.median() / max(entry["median"], 1e-9) - 1
+                flag = "✅"
+                if isRegression(timing, entry, threshold):
+                    flag = "❌"
+                    regressions += 1
+                line += "   {0} {1:+.1%}".format(flag, change)
+        print(line)
+    return regressions
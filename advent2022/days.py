@@ -0,0 +1,105 @@
+"""Finding the dayNN/ scripts and importing them without running them."""
+
+import importlib.util
+from pathlib import Path
+import re
+import sys
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DAY_DIRECTORY_REGEX = re.compile("day([0-9]{2})")
+EXAMPLE_NAME_REGEX = re.compile("EXAMPLE[0-9]*")
+# the name used for input.txt, matching most of the scripts' InputProvider
+FILE_INPUT_NAME = "INPUTFILE"
+# input.txt again, as an iterator of lines out of a memory map; only the
+# scripts whose InputProvider has this member support it
+MAPPED_INPUT_NAME = "MAPPEDFILE"
+
+
+class Day:
+    '''One dayNN/ directory that has a solver script in it.
+number: int; directory: Path; scriptPath: Path'''
+
+    def __init__(self, number: int, directory: Path, scriptPath: Path):
+        self.number = number
+        self.directory = directory
+        self.scriptPath = scriptPath
+        self._module = None
+
+    def __str__(self) -> str:
+        return "day{0:02d}".format(self.number)
+
+    def module(self):
+        '''The imported script.  Imported on first use, then kept.'''
+        if self._module is None:
+            name = str(self)
+            spec = importlib.util.spec_from_file_location(name,
+                                                          self.scriptPath)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[name]
+                raise
+            self._module = module
+        return self._module
+
+    def solverFor(self, part: int):
+        '''A function of one input str for the given part, or None when the
+script doesn't solve that part yet.  Prefers solvePart1/solvePart2 over
+solve(input, part).'''
+        module = self.module()
+        solver = getattr(module, "solvePart{0}".format(part), None)
+        if solver is not None:
+            return solver
+        solve = getattr(module, "solve", None)
+        if solve is None:
+            return None
+        return lambda input: solve(input, part=part)
+
+    def parts(self) -> [int]:
+        return [part for part in (1, 2) if self.solverFor(part) is not None]
+
+    def inputFilePath(self) -> Path:
+        return self.directory / "input.txt"
+
+    def inputNames(self) -> [str]:
+        '''The EXAMPLE* inputs of the script's InputProvider, followed by
+FILE_INPUT_NAME if there is an input.txt, and MAPPED_INPUT_NAME as well
+if the InputProvider can map it.'''
+        provider = getattr(self.module(), "InputProvider", None)
+        names = list()
+        if provider is not None:
+            names = sorted(name for name in dir(provider)
+                           if EXAMPLE_NAME_REGEX.fullmatch(name))
+        if self.inputFilePath().is_file():
+            names.append(FILE_INPUT_NAME)
+            if hasattr(provider, MAPPED_INPUT_NAME):
+                names.append(MAPPED_INPUT_NAME)
+        return names
+
+    def getInput(self, inputName: str):
+        '''The input as a str, except for MAPPED_INPUT_NAME, which is a
+fresh iterator of lines each time.'''
+        if inputName == FILE_INPUT_NAME:
+            with open(self.inputFilePath(), mode="rt") as inputFile:
+                return inputFile.read()
+        provider = self.module().InputProvider
+        # works for the Enum providers and for day07's plain class alike
+        return provider.getInput(getattr(provider, inputName))
+
+
+def discoverDays(root: Path = REPO_ROOT) -> [Day]:
+    '''Every dayNN/ under root with a dayNN*.py script, in day order.  When
+there are several takes at a day, the last one by name wins.'''
+    days = list()
+    for directory in sorted(root.iterdir()):
+        matcher = DAY_DIRECTORY_REGEX.fullmatch(directory.name)
+        if not matcher or not directory.is_dir():
+            continue
+        scripts = sorted(directory.glob(directory.name + "*.py"))
+        if len(scripts) == 0:
+            continue
+        days.append(Day(int(matcher.group(1)), directory, scripts[-1]))
+    return days
@@ -0,0 +1,260 @@
+"""Synthetic puzzle inputs at any scale, for finding where solvers slow down.
+
+scale multiplies the size of the real input.txt of each day (scale 1 is
+about as big as the real thing), and the same seed always gives the same
+text.  Each generateDayNN(scale, rng) returns the whole input as a str.
+
+    python -m advent2022 generate --day 8 --scale 100 > big08.txt
+"""
+
+import math
+import random
+import string
+
+
+DEFAULT_SEED = 2022
+
+
+def randomName(rng: random.Random, taken: set) -> str:
+    '''A fresh lowercase name, like the ones in day07's transcript.'''
+    while True:
+        name = ''.join(rng.choices(string.ascii_lowercase,
+                                   k=rng.randint(3, 8)))
+        if name not in taken:
+            taken.add(name)
+            return name
+
+
+def generateDay01(scale: int, rng: random.Random) -> str:
+    '''Blank-line separated groups of calories, 250 elves per scale.'''
+    elves = list()
+    for _ in range(250 * scale):
+        items = [str(rng.randint(1000, 60000))
+                 for _ in range(rng.randint(1, 15))]
+        elves.append('\n'.join(items))
+    return '\n\n'.join(elves) + '\n'
+
+
+def generateDay02(scale: int, rng: random.Random) -> str:
+    lines = ["{0} {1}".format(rng.choice("ABC"), rng.choice("XYZ"))
+             for _ in range(2500 * scale)]
+    return '\n'.join(lines) + '\n'
+
+
+def generateDay03(scale: int, rng: random.Random) -> str:
+    '''Rucksacks in groups of three.  Both halves of a sack share exactly one
+item, and the three sacks of a group share exactly one badge.'''
+    allLetters = string.ascii_letters
+    lines = list()
+    for _ in range(100 * scale):
+        badge = rng.choice(allLetters)
+        others = [letter for letter in allLetters if letter != badge]
+        rng.shuffle(others)
+        # disjoint letters per sack, so the badge is all they have in common
+        for pool in (others[0:17], others[17:34], others[34:51]):
+            shared = rng.choice(pool + [badge])
+            rest = [letter for letter in pool + [badge] if letter != shared]
+            rng.shuffle(rest)
+            leftLetters = rest[:len(rest) // 2]
+            rightLetters = rest[len(rest) // 2:]
+            halfLength = rng.randint(4, 16)
+            left = [shared] + rng.choices(leftLetters, k=halfLength - 1)
+            right = [shared] + rng.choices(rightLetters, k=halfLength - 1)
+            if badge != shared:
+                # make sure the badge really is in the sack
+                if badge in leftLetters:
+                    left[1] = badge
+                else:
+                    right[1] = badge
+            rng.shuffle(left)
+            rng.shuffle(right)
+            lines.append(''.join(left) + ''.join(right))
+    return '\n'.join(lines) + '\n'
+
+
+def generateDay04(scale: int, rng: random.Random) -> str:
+    lines = list()
+    for _ in range(1000 * scale):
+        bounds = list()
+        for _ in range(2):
+            start = rng.randint(1, 99)
+            bounds.append("{0}-{1}".format(start, rng.randint(start, 99)))
+        lines.append(','.join(bounds))
+    return '\n'.join(lines) + '\n'
+
+
+def generateDay05(scale: int, rng: random.Random, stackCount: int = 9) -> str:
+    '''A drawing of stackCount stacks 8 × scale crates high at most, then
+500 × scale moves that never take more crates than a stack holds.'''
+    heights = [rng.randint(1, 8 * scale) for _ in range(stackCount)]
+    stacks = [rng.choices(string.ascii_uppercase, k=height)
+              for height in heights]
+    lines = list()
+    for level in range(max(heights) - 1, -1, -1):
+        cells = ["[{0}]".format(stack[level]) if len(stack) > level
+                 else "   " for stack in stacks]
+        lines.append(' '.join(cells))
+    lines.append(' '.join("{0:^3d}".format(n)
+                          for n in range(1, stackCount + 1)))
+    lines.append('')
+    for _ in range(500 * scale):
+        fromStack = rng.choice([n for n in range(stackCount) if heights[n]])
+        toStack = rng.choice([n for n in range(stackCount) if n != fromStack])
+        count = rng.randint(1, min(heights[fromStack], 40))
+        heights[fromStack] -= count
+        heights[toStack] += count
+        lines.append("move {0} from {1} to {2}".format(count, fromStack + 1,
+                                                      toStack + 1))
+    return '\n'.join(lines) + '\n'
+
+
+def generateDay06(scale: int, rng: random.Random) -> str:
+    '''4096 × scale characters.  The first 90% use only three letters, so
+both markers come late and the solver has to scan most of the stream.'''
+    length = 4096 * scale
+    prefixLength = length * 9 // 10
+    prefix = rng.choices("abc", k=prefixLength)
+    marker = rng.sample(string.ascii_lowercase, 14)
+    rest = rng.choices(string.ascii_lowercase,
+                       k=max(length - prefixLength - 14, 0))
+    return ''.join(prefix + marker + rest) + '\n'
+
+
+def generateDay07(scale: int, rng: random.Random, maxDepth: int = 30) -> str:
+    '''A `$ cd`/`$ ls` transcript of 190 × scale directories nested up to
+maxDepth deep, visited depth first like the real one.'''
+    dirCount = 190 * scale
+    parents = [-1]
+    depths = [0]
+    for i in range(1, dirCount):
+        # mostly hang new directories under recent ones, which nests deeply
+        parent = rng.randint(max(0, i - 16), i - 1)
+        while depths[parent] >= maxDepth:
+            parent = parents[parent]
+        parents.append(parent)
+        depths.append(depths[parent] + 1)
+    children = [list() for _ in range(dirCount)]
+    for i in range(1, dirCount):
+        children[parents[i]].append(i)
+
+    names = ["/"] + [''] * (dirCount - 1)
+    lines = ["$ cd /"]
+    # (directory, index of next child to visit); no recursion, maxDepth free
+    stack = [(0, -1)]
+    while stack:
+        directory, childIndex = stack.pop()
+        if childIndex == -1:
+            lines.append("$ ls")
+            taken = set()
+            for child in children[directory]:
+                names[child] = randomName(rng, taken)
+                lines.append("dir " + names[child])
+            for _ in range(rng.randint(0, 6)):
+                # plenty of small files, so some directories stay < 100000
+                size = rng.randint(1, 20000) if rng.random() < 0.5 \
+                    else rng.randint(20000, 300000)
+                fileName = randomName(rng, taken)
+                if rng.random() < 0.5:
+                    fileName += "." + rng.choice(["txt", "dat", "log", "lst"])
+                lines.append("{0} {1}".format(size, fileName))
+            childIndex = 0
+        if childIndex < len(children[directory]):
+            child = children[directory][childIndex]
+            stack.append((directory, childIndex + 1))
+            stack.append((child, -1))
+            lines.append("$ cd " + names[child])
+        elif stack:
+            lines.append("$ cd ..")
+    return '\n'.join(lines) + '\n'
+
+
+def generateDay08(scale: int, rng: random.Random, side: int = None) -> str:
+    '''A square forest with scale times the trees of the real 99 × 99 one,
+unless side is given.'''
+    if side is None:
+        side = round(99 * math.sqrt(scale))
+    lines = [''.join(rng.choices(string.digits, k=side))
+             for _ in range(side)]
+    return '\n'.join(lines) + '\n'
+
+
+def generateDay09(scale: int, rng: random.Random) -> str:
+    lines = ["{0} {1}".format(rng.choice("UDLR"), rng.randint(1, 19))
+             for _ in range(2000 * scale)]
+    return '\n'.join(lines) + '\n'
+
+
+def generateDay10(scale: int, rng: random.Random) -> str:
+    '''At least 240 × scale cycles of noop/addx, keeping X on the screen.'''
+    lines = list()
+    cycles = 0
+    regX = 1
+    while cycles < 240 * scale + 2:
+        if rng.random() < 0.3:
+            lines.append("noop")
+            cycles += 1
+        else:
+            value = rng.randint(-10, 10)
+            if not 0 <= regX + value <= 39:
+                value = -value
+            if not 0 <= regX + value <= 39:
+                value = 0
+            regX += value
+            lines.append("addx {0}".format(value))
+            cycles += 2
+    return '\n'.join(lines) + '\n'
+
+
+def generateDay11(scale: int, rng: random.Random) -> str:
+    '''8 × scale monkeys, each testing divisibility by a small prime.'''
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+    monkeyCount = 8 * scale
+    blocks = list()
+    for monkey in range(monkeyCount):
+        items = ', '.join(str(rng.randint(50, 99))
+                          for _ in range(rng.randint(1, 8)))
+        operation = rng.choice(["old * {0}".format(rng.randint(2, 19)),
+                                "old + {0}".format(rng.randint(1, 8)),
+                                "old * old"])
+        ifTrue = ifFalse = monkey
+        while ifTrue == monkey:
+            ifTrue = rng.randrange(monkeyCount)
+        while ifFalse in (monkey, ifTrue):
+            ifFalse = rng.randrange(monkeyCount)
+        blocks.append("""\
+Monkey {0}:
+  Starting items: {1}
+  Operation: new = {2}
+  Test: divisible by {3}
+    If true: throw to monkey {4}
+    If false: throw to monkey {5}
+""".format(monkey, items, operation, rng.choice(primes), ifTrue, ifFalse))
+    return '\n'.join(blocks)
+
+
+GENERATORS = {
+    1: generateDay01,
+    2: generateDay02,
+    3: generateDay03,
+    4: generateDay04,
+    5: generateDay05,
+    6: generateDay06,
+    7: generateDay07,
+    8: generateDay08,
+    9: generateDay09,
+    10: generateDay10,
+    11: generateDay11,
+}
+
+
+def generate(day: int, scale: int = 1, seed: int = DEFAULT_SEED,
+             **options) -> str:
+    '''The input for day at scale.  options go to that day's generator,
+e.g. side=5000 for day 8 or stackCount=500 for day 5.'''
+    if day not in GENERATORS:
+        raise ValueError("no generator for day {0}".format(day))
+    if scale < 1:
+        raise ValueError("parameter 'scale' must be at least one.")
+    # mix the day in, so days don't all share one random sequence
+    rng = random.Random(seed * 100 + day)
+    return GENERATORS[day](scale, rng, **options)
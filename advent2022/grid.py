@@ -0,0 +1,154 @@
+"""A 2D grid of ints kept flat in one array.array('i'), for the day scripts.
+
+Row y is grid[y * width : (y + 1) * width], so rows and columns come out as
+memoryview slices without copying.  Cells can be read by flat int index,
+(y, x) tuple or Coordinate; get(y, x) and set(y, x, value) skip even that
+dispatch for the hot loops.
+"""
+
+import array
+
+
+class Coordinate:
+    '''A mutable (y, x).  += moves it in place rather than making a new one,
+so copy it before moving one that somebody else holds, and don't put one
+in a set or dict and move it afterwards.'''
+
+    __slots__ = ("y", "x")
+
+    def __init__(self, y: int, x: int):
+        self.y = y
+        self.x = x
+
+    def __iadd__(self, other):
+        self.y += other.y
+        self.x += other.x
+        return self
+
+    def __add__(lhs, rhs):
+        return Coordinate(lhs.y + rhs.y, lhs.x + rhs.x)
+
+    def __str__(self):
+        return "✦(y:{0},x:{1})".format(self.y, self.x)
+
+    def __eq__(self, other) -> bool:
+        return (self.y == other.y) and (self.x == other.x)
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def copy(self):
+        return Coordinate(self.y, self.x)
+
+
+class Grid_int:
+    '''An Array of integers indexable by Coordinates, (y, x) tuples or flat
+int indexes.
+height: int; width: int; grid: array.array('i') (is flattened 2D array)
+checkBounds: bool, when False (y, x) indexes are trusted, and an x off the
+end of a row silently lands in the next one.'''
+
+    def __init__(self, height: int, width: int, grid: [int],
+                 checkBounds: bool = True):
+        if not isinstance(grid, array.array):
+            grid = array.array('i', grid)
+        assert (width * height) == len(grid),\
+            "w:{0} × h:{1} != len(grid):{2}".format(width, height, len(grid))
+        self.height = height
+        self.width = width
+        self.grid = grid
+        self.checkBounds = checkBounds
+
+    @classmethod
+    def makeGrid(Cls, array2D: [[int]], checkBounds: bool = True):
+        '''Make a Grid_int from a 2D array of int's.'''
+        widthsSet = set(map(len, array2D))
+        assert len(widthsSet) == 1, "rows are not all the same width"
+        width = widthsSet.pop()
+        flattened = array.array('i')
+        for innerList in array2D:
+            flattened.extend(innerList)
+        return Cls(len(array2D), width, flattened, checkBounds)
+
+    def index(self, y: int, x: int) -> int:
+        '''Flatten (y, x) into a single int index to subscript into
+self.grid with.'''
+        if self.checkBounds and not (0 <= y < self.height and
+                                     0 <= x < self.width):
+            raise IndexError("(y:{0}, x:{1}) is outside of h:{2} × w:{3}"
+                             .format(y, x, self.height, self.width))
+        return (y * self.width) + x
+
+    def _makeIndex(self, coordinate: Coordinate) -> int:
+        return self.index(coordinate.y, coordinate.x)
+
+    def get(self, y: int, x: int) -> int:
+        return self.grid[self.index(y, x)]
+
+    def set(self, y: int, x: int, newValue: int):
+        self.grid[self.index(y, x)] = newValue
+
+    def __getitem__(self, idx):
+        kind = idx.__class__
+        if kind is int:
+            return self.grid[idx]
+        elif kind is tuple:
+            return self.grid[self.index(*idx)]
+        elif kind is Coordinate:
+            return self.grid[self.index(idx.y, idx.x)]
+        raise TypeError("Invalid index type; expected int, (y, x) or "
+                        "Coordinate, not: {0}.".format(kind))
+
+    def __setitem__(self, idx, newValue: int):
+        kind = idx.__class__
+        if kind is int:
+            self.grid[idx] = newValue
+        elif kind is tuple:
+            self.grid[self.index(*idx)] = newValue
+        elif kind is Coordinate:
+            self.grid[self.index(idx.y, idx.x)] = newValue
+        else:
+            raise TypeError("Invalid index type; expected int, (y, x) or "
+                            "Coordinate, not: {0}.".format(kind))
+
+    def __len__(self) -> int:
+        return len(self.grid)
+
+    def row(self, y: int) -> memoryview:
+        '''Row y, west to east, as a memoryview into self.grid.  [::-1] of
+it runs east to west.  self.grid can't grow or shrink while it's held.'''
+        if not 0 <= y < self.height:
+            raise IndexError("no row {0} in a grid {1} high"
+                             .format(y, self.height))
+        start = y * self.width
+        return memoryview(self.grid)[start : start + self.width]
+
+    def column(self, x: int) -> memoryview:
+        '''Column x, north to south, as a strided memoryview into
+self.grid; like row(), it holds self.grid's size fixed.'''
+        if not 0 <= x < self.width:
+            raise IndexError("no column {0} in a grid {1} wide"
+                             .format(x, self.width))
+        return memoryview(self.grid)[x :: self.width]
+
+    def isInBounds(self, y: int, x: int) -> bool:
+        return (0 <= y < self.height) and (0 <= x < self.width)
+
+    def isCoordInBounds(self, coord: Coordinate) -> bool:
+        return self.isInBounds(coord.y, coord.x)
+
+    def __str__(self) -> str:
+        lines: [str] = list()
+        for y in range(0, self.height):
+            line = '[' if y == 0 else ' ['
+            line += ', '.join(map(lambda i: "{0:>2}".format(i), self.row(y)))
+            line += ']'
+            lines.append(line)
+        output = '[' + ',\n'.join(lines) + ']\n'
+        return output
+
+    def allCoordinates(self) -> [Coordinate]:
+        '''All valid coordinates of this 2D array.'''
+        return [Coordinate(y, x)
+                for y in range(0, self.height)
+                for x in range(0, self.width)]
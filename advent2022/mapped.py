@@ -0,0 +1,48 @@
+"""Reading a day's input out of a memory map instead of into one str.
+
+mappedBytes is the whole file as one read-only memoryview, for the days that
+want to scan the raw bytes.  The generators open the file, map it read-only,
+and yield pieces of it as they're asked for, so only the current piece is
+ever copied into memory.  The file is closed after the last piece.  mmap
+can't map an empty file, so an empty one is an empty view, or yields
+nothing.
+"""
+
+from contextlib import contextmanager
+import mmap
+import os
+
+
+@contextmanager
+def mappedBytes(path: str):
+    '''A read-only memoryview of the whole file at path.  The file is
+closed when the with block ends; don't keep the view, or slices of it, past
+that.'''
+    with open(path, mode="rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def mappedLines(path: str):
+    '''Yields each line of the file at path, without its line ending.'''
+    with open(path, mode="rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b""):
+                yield line.rstrip(b"\r\n").decode()
+
+
+def mappedChunks(path: str, chunkSize: int = 1 << 16):
+    '''Yields the file at path as str chunks of chunkSize bytes.  It's
+decoded as ascii, so a chunk boundary can't split a character.'''
+    with mappedBytes(path) as view:
+        for start in range(0, len(view), chunkSize):
+            yield str(view[start : start + chunkSize], "ascii")
@@ -0,0 +1,206 @@
+"""Running many day/part/input combinations and reporting on them together."""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import time
+import traceback
+
+from advent2022.days import Day, FILE_INPUT_NAME, MAPPED_INPUT_NAME
+from advent2022.tracing import flushLogs
+
+
+# Known answers, taken from the run(...) calls at the bottom of each script.
+# Keyed by (day, inputName, part).
+EXPECTED_SOLUTIONS = {
+    (1, "EXAMPLE", 1): 24000,
+    (1, "EXAMPLE", 2): 45000,
+    (2, "EXAMPLE", 1): 15,
+    (2, "EXAMPLE", 2): 12,
+    (3, "EXAMPLE", 1): 157,
+    (3, "EXAMPLE", 2): 70,
+    (4, "EXAMPLE", 1): 2,
+    (4, "EXAMPLE", 2): 4,
+    (4, FILE_INPUT_NAME, 1): 582,
+    (5, "EXAMPLE", 1): "CMZ",
+    (5, "EXAMPLE", 2): "MCD",
+    (6, "EXAMPLE1", 1): 7,
+    (6, "EXAMPLE2", 1): 5,
+    (6, "EXAMPLE3", 1): 6,
+    (6, "EXAMPLE4", 1): 10,
+    (6, "EXAMPLE5", 1): 11,
+    (6, FILE_INPUT_NAME, 1): 1531,
+    (6, "EXAMPLE1", 2): 19,
+    (6, "EXAMPLE2", 2): 23,
+    (6, "EXAMPLE3", 2): 23,
+    (6, "EXAMPLE4", 2): 29,
+    (6, "EXAMPLE5", 2): 26,
+    (7, "EXAMPLE", 1): 95437,
+    (7, FILE_INPUT_NAME, 1): 1770595,
+    (7, "EXAMPLE", 2): 24933642,
+    (8, "EXAMPLE", 1): 21,
+    (8, "EXAMPLE", 2): 8,
+    (9, "EXAMPLE", 1): 13,
+    (9, FILE_INPUT_NAME, 1): 6018,
+    (9, "EXAMPLE", 2): 1,
+    (9, "EXAMPLE2", 2): 36,
+    (9, FILE_INPUT_NAME, 2): 2619,
+    (10, "EXAMPLE", 1): 13140,
+    (10, FILE_INPUT_NAME, 1): 13480,
+    (11, "EXAMPLE", 1): 10605,
+    (11, FILE_INPUT_NAME, 1): 95472,
+}
+
+
+class Result:
+    '''The outcome of running one solver on one input.
+solution is () when the solver raised; error then holds the traceback.'''
+
+    def __init__(self, day: int, part: int, inputName: str, solution=(),
+                 expectedSolution=(), seconds: float = 0.0, error: str = ''):
+        self.day = day
+        self.part = part
+        self.inputName = inputName
+        self.solution = solution
+        self.expectedSolution = expectedSolution
+        self.seconds = seconds
+        self.error = error
+
+    def finishChar(self) -> str:
+        '''Same flags as the scripts' run(): 🏁 for unchecked answers.'''
+        if self.error or (self.expectedSolution != () and
+                          self.expectedSolution != self.solution):
+            return "❌"
+        if self.expectedSolution != ():
+            return "✅"
+        return "🏁"
+
+    def reportLine(self) -> str:
+        answer = self.solution
+        if self.error:
+            answer = self.error.strip().splitlines()[-1]
+        elif isinstance(answer, str) and "\n" in answer:
+            # day10 part 2 draws letters; they don't fit on one line
+            answer = "(drawing, {0} lines)".format(len(answer.splitlines()))
+        line = "day{0:02d} part {1}  {2:<10} {3:>9.4f}s  {4} {5}".format(
+            self.day, self.part, self.inputName, self.seconds,
+            self.finishChar(), answer)
+        if self.expectedSolution != () and \
+           self.expectedSolution != self.solution:
+            line += "   expected: " + str(self.expectedSolution)
+        return line
+
+
+def runOne(day: Day, part: int, inputName: str) -> Result:
+    '''Solve one day/part/input, timing only the solver itself.'''
+    # a mapped input.txt is still input.txt
+    expectedName = FILE_INPUT_NAME if inputName == MAPPED_INPUT_NAME \
+        else inputName
+    expectedSolution = EXPECTED_SOLUTIONS.get(
+        (day.number, expectedName, part), ())
+    try:
+        input = day.getInput(inputName)
+        solver = day.solverFor(part)
+        start = time.perf_counter()
+        solution = solver(input)
+        seconds = time.perf_counter() - start
+    except Exception:
+        return Result(day.number, part, inputName,
+                      expectedSolution=expectedSolution,
+                      error=traceback.format_exc())
+    return Result(day.number, part, inputName, solution, expectedSolution,
+                  seconds)
+
+
+def selectInputNames(day: Day, inputKinds: [str]) -> [str]:
+    '''inputKinds holds "example" and/or "file"; "example" means all of the
+day's EXAMPLE* inputs.'''
+    names = list()
+    for name in day.inputNames():
+        isFile = name in (FILE_INPUT_NAME, MAPPED_INPUT_NAME)
+        if (isFile and "file" in inputKinds) or \
+           (not isFile and "example" in inputKinds):
+            names.append(name)
+    return names
+
+
+def planRuns(day: Day, parts: [int], inputKinds: [str]) -> [(int, str)]:
+    '''The (part, inputName) pairs to run for one day, in report order.
+Imports the day's script, so it raises whatever the import raises.'''
+    dayParts = day.parts()
+    inputNames = selectInputNames(day, inputKinds)
+    return [(part, inputName)
+            for part in parts if part in dayParts
+            for inputName in inputNames]
+
+
+# Days imported in this process when it is a pool worker, by script path
+_workerDays = dict()
+
+
+def runOneInWorker(dayNumber: int, directory: Path, scriptPath: Path,
+                   part: int, inputName: str) -> Result:
+    '''runOne() for a pool worker.  Day objects hold their imported module,
+which doesn't pickle, so each worker makes (and imports) its own once.'''
+    day = _workerDays.get(scriptPath)
+    if day is None:
+        day = Day(dayNumber, directory, scriptPath)
+        _workerDays[scriptPath] = day
+    result = runOne(day, part, inputName)
+    # workers end without running atexit, so nothing may stay buffered
+    flushLogs()
+    return result
+
+
+def runDays(days: [Day], parts: [int] = (1, 2),
+            inputKinds: [str] = ("example", "file"), jobs: int = 1,
+            initializer=None, initargs=()) -> [Result]:
+    '''Run every selected solver and return the Results in day/part/input
+order.  With jobs > 1 the runs are spread over that many processes, each
+set up by initializer(*initargs); the order of the Results doesn't change.
+A day whose script fails to import gets a single part 0 Result.'''
+    # each slot is either a finished Result or a (day, part, inputName) to run
+    slots = list()
+    for day in days:
+        try:
+            runs = planRuns(day, parts, inputKinds)
+        except Exception:
+            slots.append(Result(day.number, 0, '',
+                                error=traceback.format_exc()))
+            continue
+        for part, inputName in runs:
+            slots.append((day, part, inputName))
+
+    if jobs <= 1:
+        return [slot if type(slot) is Result else runOne(*slot)
+                for slot in slots]
+
+    # forked workers would otherwise write our buffered traces a second time
+    flushLogs()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer,
+                             initargs=initargs) as executor:
+        futures = list()
+        for slot in slots:
+            if type(slot) is Result:
+                futures.append(slot)
+            else:
+                day, part, inputName = slot
+                futures.append(executor.submit(
+                    runOneInWorker, day.number, day.directory,
+                    day.scriptPath, part, inputName))
+        return [future if type(future) is Result else future.result()
+                for future in futures]
+
+
+def printReport(results: [Result], wallSeconds: float = None):
+    '''wallSeconds is the elapsed time of the whole batch, which is less
+than the sum of the solve times when the runs were in parallel.'''
+    print("------------------------ report ------------------------")
+    for result in results:
+        print(result.reportLine())
+    total = sum(result.seconds for result in results)
+    failures = sum(1 for result in results if result.finishChar() == "❌")
+    summary = "{0} runs, {1} ❌, {2:.4f}s solving".format(len(results),
+                                                          failures, total)
+    if wallSeconds is not None:
+        summary += ", {0:.4f}s wall".format(wallSeconds)
+    print(summary)
@@ -0,0 +1,68 @@
+"""Turning the day scripts' tracing on and off.
+
+Every script logs to its own logger, "advent2022.dayNN", under the
+"advent2022" parent.  Nothing is shown below WARNING unless configured here,
+and a disabled log.debug() is one cached level check.
+"""
+
+import logging
+
+
+ROOT_LOGGER_NAME = "advent2022"
+FORMAT = "%(name)s %(levelname)s %(message)s"
+
+
+def dayLoggerName(day: int) -> str:
+    return "{0}.day{1:02d}".format(ROOT_LOGGER_NAME, day)
+
+
+class BufferedFileHandler(logging.FileHandler):
+    '''A FileHandler that lets a large file buffer decide when to write,
+instead of flushing after every record like FileHandler does.  Records are
+still formatted as they arrive, so later mutation of logged objects (a
+Dock, a list of stacks) doesn't change what was traced.'''
+
+    def __init__(self, filename: str, mode: str = "w",
+                 bufferSize: int = 1 << 20):
+        self.bufferSize = bufferSize
+        super().__init__(filename, mode=mode, encoding="utf-8")
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.bufferSize,
+                    encoding=self.encoding)
+
+    def flush(self):
+        pass    # close(), or flushLogs(), writes what is buffered
+
+    def flushBuffer(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+
+def configureLogging(level: str = "WARNING", dayLevels: dict = None,
+                     logFile: str = None, append: bool = False):
+    '''level applies to every day; dayLevels ({day number: level name})
+overrides it per day.  Traces go to stderr, or to logFile through a
+BufferedFileHandler.  append keeps an existing logFile, which pool workers
+use so they don't truncate each other's traces.'''
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    if logFile:
+        handler = BufferedFileHandler(logFile, mode="a" if append else "w")
+    else:
+        handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(FORMAT))
+    root.addHandler(handler)
+    root.propagate = False
+    root.setLevel(level)
+    for day, dayLevel in (dayLevels or {}).items():
+        logging.getLogger(dayLoggerName(day)).setLevel(dayLevel)
+
+
+def flushLogs():
+    '''Write out whatever BufferedFileHandlers are holding.'''
+    for handler in logging.getLogger(ROOT_LOGGER_NAME).handlers:
+        if isinstance(handler, BufferedFileHandler):
+            handler.flushBuffer()
@@ -3,17 +3,37 @@
 
 from enum import Enum, auto
 import functools
+import heapq
+import logging
+import os
+import sys
 
 
-# global variable to make functions more chatty for debugging
-verbose = True
+# the input readers live in the advent2022 package at the top of the
+# repository, which isn't on sys.path when this file is run on its own
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+    sys.path.append(repoRoot)
+from advent2022.mapped import mappedLines
+
+
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day01")
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
     """The function getInput() is the star here, giving you the input string to
-    work with."""
+    work with.  MAPPEDFILE gives an iterator over the lines of input.txt
+    instead, for inputs too big to hold in memory."""
     EXAMPLE = auto()
     INPUTFILE = auto()
+    MAPPEDFILE = auto()
 
     def getInput(self) -> str:
         match self:
@@ -35,36 +55,53 @@ class InputProvider(Enum):
 10000
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
-
-
-def solve(input: str, part=1) -> int:
-    # don't use splitlines() because we want to keep the blank lines
-    splitByLine = input.split("\n")
-
-    elves = []
-    currentGroup = []
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
+            case InputProvider.MAPPEDFILE:
+                return mappedLines(inputFilePath)
+
+
+def solve(input, part=1) -> int:
+    '''input is the whole str, or an iterator of its lines (MAPPEDFILE).
+Only the three biggest elves are kept, so memory stays constant either way.'''
+    splitByLine = input
+    if isinstance(input, str):
+        # don't use splitlines() because we want to keep the blank lines
+        splitByLine = input.split("\n")
+
+    tracing = log.isEnabledFor(logging.DEBUG)
+    elves = []          # only filled in when tracing
+    biggestElves = []   # min-heap of at most three
+    currentSum = 0
+    inGroup = False
     for line in splitByLine:
-        if line == '' and len(currentGroup) > 0:     # end of current
-            sum = functools.reduce(lambda l, r: l+r, currentGroup)
-            elves.append(sum)
-            currentGroup = []
+        if line == '':
+            if inGroup:     # end of current
+                heapq.heappush(biggestElves, currentSum)
+                if len(biggestElves) > 3:
+                    heapq.heappop(biggestElves)
+                if tracing:
+                    elves.append(currentSum)
+                currentSum = 0
+                inGroup = False
         else:
-            n = int(line)
-            currentGroup.append(n)
+            currentSum += int(line)
+            inGroup = True
+    if inGroup:     # no blank line after the last elf
+        heapq.heappush(biggestElves, currentSum)
+        if len(biggestElves) > 3:
+            heapq.heappop(biggestElves)
+        if tracing:
+            elves.append(currentSum)
     if part == 1:
-        biggestElf = max(elves)
-        if verbose:
-            print("solveλ elves:", elves)
-            print("     λ biggest elf:", biggestElf)
+        biggestElf = max(biggestElves)
+        log.debug("solveλ elves: %s", elves)
+        log.debug("     λ biggest elf: %s", biggestElf)
         return biggestElf
     elif part == 2:
-        elves.sort()
-        topThree = elves[-3:]
-        if verbose:
-            print("solveλ elves:", elves)
-            print("     λ top3 elves:", topThree)
+        topThree = sorted(biggestElves)
+        log.debug("solveλ elves: %s", sorted(elves) if tracing else elves)
+        log.debug("     λ top3 elves: %s", topThree)
         sumOfTopThree = functools.reduce(lambda l, r: l+r, topThree)
         return sumOfTopThree
 
@@ -84,7 +121,9 @@ def run(inputProvider, part=1, expectedSolution=()):
           "  expected:", str(expectedSolution), "\n")
 
 
-run(InputProvider.EXAMPLE, part=1, expectedSolution=24000)
-run(InputProvider.INPUTFILE, part=1)
-run(InputProvider.EXAMPLE, part=2, expectedSolution=45000)
-run(InputProvider.INPUTFILE, part=2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.DEBUG)
+    run(InputProvider.EXAMPLE, part=1, expectedSolution=24000)
+    run(InputProvider.INPUTFILE, part=1)
+    run(InputProvider.EXAMPLE, part=2, expectedSolution=45000)
+    run(InputProvider.INPUTFILE, part=2)
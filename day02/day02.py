@@ -2,9 +2,22 @@
 
 import re
 from enum import Enum, auto
+import logging
+import os
+import sys
 
 
-verbose = False
+# the input readers live in the advent2022 package at the top of the
+# repository, which isn't on sys.path when this file is run on its own
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+    sys.path.append(repoRoot)
+from advent2022.mapped import mappedLines
+
+
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day02")
 
 
 lineParser = re.compile('([ABC]) ([XYZ])')
@@ -39,9 +52,6 @@ class Outcome(Enum):
 def lineToPoints(line: str) -> int:
     '''Takes line of puzzle input and determines points awarded to me.'''
     playMatcher = lineParser.search(line)
-    if verbose:
-        print("lineToPointsλ type(lineParser):", type(lineParser),
-              " type(playMatcher):", type(playMatcher))
     opPlayCh = playMatcher.group(1)
     myPlayCh = playMatcher.group(2)
     opPlay: Rps
@@ -62,10 +72,8 @@ def lineToPoints(line: str) -> int:
         case 1: outcome = Outcome.LOSE
         case 2: outcome = Outcome.WIN
     myPointsEarned = outcome.pointValue() + myPlay.pointValue()
-    if verbose:
-        print("lineToPointsλ opPlay:", opPlay, " myPlay:", myPlay,
-              " outcome:", outcome)
-        print("    myPointsEarned:", myPointsEarned)
+    log.debug("lineToPointsλ opPlay: %s  myPlay: %s  outcome: %s"
+              "    myPointsEarned: %d", opPlay, myPlay, outcome, myPointsEarned)
     return myPointsEarned
 
 
@@ -107,16 +115,21 @@ def lineToPointsPart2(line: str) -> int:
         case "Z": myOutcome = Outcome.WIN
     myPlay: Rps = playAgainstForOutcome(opPlay, myOutcome)
     myPointsEarned = myOutcome.pointValue() + myPlay.pointValue()
-    if verbose:
-        print("lineToPointsPart2λ opPlay:", opPlay, " myOutcome:", myOutcome,
-              " myPlay:", myPlay)
-        print("    myPointsEarned:", myPointsEarned)
+    log.debug("lineToPointsPart2λ opPlay: %s  myOutcome: %s  myPlay: %s"
+              "    myPointsEarned: %d", opPlay, myOutcome, myPlay,
+              myPointsEarned)
     return myPointsEarned
 
 
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
+
+
 class InputProvider(Enum):
     EXAMPLE = auto()
     FILE = auto()
+    MAPPEDFILE = auto()
 
     def getInput(self) -> str:
         match self:
@@ -126,8 +139,10 @@ B X
 C Z
 '''
             case InputProvider.FILE:
-                file = open("input.txt")
-                return file.read()
+                with open(inputFilePath) as file:
+                    return file.read()
+            case InputProvider.MAPPEDFILE:
+                return mappedLines(inputFilePath)
 
 
 def run(inputProvider: InputProvider, part=1, expectedSolution=()):
@@ -145,9 +160,13 @@ def run(inputProvider: InputProvider, part=1, expectedSolution=()):
           "  expected:", str(expectedSolution), "\n")
 
 
-def solve(input: str, part: int) -> int:
+def solve(input, part: int) -> int:
+    '''input is the whole str, or an iterator of its lines (MAPPEDFILE).'''
     myPoints = 0
-    splitByLine = input.splitlines()
+    splitByLine = input
+    if isinstance(input, str):
+        splitByLine = input.splitlines()
+    tracing = log.isEnabledFor(logging.DEBUG)
     for line in splitByLine:
         pointsForLine: int
         if part == 1:
@@ -155,13 +174,15 @@ def solve(input: str, part: int) -> int:
         elif part == 2:
             pointsForLine = lineToPointsPart2(line)
         myPoints += pointsForLine
-        if verbose:
-            print("solveλ line:", line, "  points:", pointsForLine,
-                  "current total:", myPoints)
+        if tracing:
+            log.debug("solveλ line: %s  points: %d  current total: %d",
+                      line, pointsForLine, myPoints)
     return myPoints
 
 
-run(InputProvider.EXAMPLE, part=1, expectedSolution=15)
-run(InputProvider.FILE, part=1)
-run(InputProvider.EXAMPLE, part=2, expectedSolution=12)
-run(InputProvider.FILE, part=2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    run(InputProvider.EXAMPLE, part=1, expectedSolution=15)
+    run(InputProvider.FILE, part=1)
+    run(InputProvider.EXAMPLE, part=2, expectedSolution=12)
+    run(InputProvider.FILE, part=2)
@@ -1,9 +1,17 @@
 # Advent of Code
 
 from enum import Enum, auto
+import logging
+import os
 
-# global variable to make functions more chatty for debugging
-verbose = False
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day03")
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
@@ -24,8 +32,8 @@ ttgJtRGJQctTZtZT
 CrZsJsPPZsGzwwsLwLmpwMDw
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
 
 
 def run(inputProvider, part=1, expectedSolution=()):
@@ -55,14 +63,15 @@ def solve(input, part=1) -> int:
         return solvePart2(input)
     splitByLine = input.splitlines()
     prioritySum = 0
+    tracing = log.isEnabledFor(logging.DEBUG)
     for line in splitByLine:
         # cut in half with bitshift right
         lengthOfSack = len(line) >> 1
         leftSackStr = line[:lengthOfSack]
         rightSackStr = line[lengthOfSack:]
-        if verbose:
-            print("solveλ L:", leftSackStr)
-            print("       R:", rightSackStr)
+        if tracing:
+            log.debug("solveλ L: %s", leftSackStr)
+            log.debug("       R: %s", rightSackStr)
         leftSack = set(leftSackStr)
         rightSack = set(rightSackStr)
         shared = leftSack & rightSack
@@ -70,15 +79,17 @@ def solve(input, part=1) -> int:
         sharedItem: chr = shared.pop()
         priority = getPriority(sharedItem)
         prioritySum += priority
-        if verbose:
-            print("solveλ sharedItem:", sharedItem, " priority:", priority,
-                  "        prioritySum:", prioritySum)
+        if tracing:
+            log.debug("solveλ sharedItem: %s  priority: %d"
+                      "        prioritySum: %d",
+                      sharedItem, priority, prioritySum)
     return prioritySum
 
 
 def solvePart2(input: str) -> int:
     prioritySum = 0
     splitByLine = input.splitlines()
+    tracing = log.isEnabledFor(logging.DEBUG)
     for groupOf3Start in range(len(splitByLine))[::3]:
         first = set(splitByLine[groupOf3Start])
         second = set(splitByLine[groupOf3Start + 1])
@@ -88,15 +99,17 @@ def solvePart2(input: str) -> int:
         commonItem = commonItemSet.pop()
         priority = getPriority(commonItem)
         prioritySum += priority
-        if verbose:
-            print("solvePart2λ groupOf3Start:", groupOf3Start,
-                  "commonItem:", commonItem, "priority:", priority,
-                  "prioritySum:", prioritySum)
+        if tracing:
+            log.debug("solvePart2λ groupOf3Start: %d commonItem: %s"
+                      " priority: %d prioritySum: %d",
+                      groupOf3Start, commonItem, priority, prioritySum)
     return prioritySum
 
 
-# TODO: fill in example solution
-run(InputProvider.EXAMPLE, part=1, expectedSolution=157)
-run(InputProvider.INPUTFILE, part=1)
-run(InputProvider.EXAMPLE, part=2, expectedSolution=70)
-run(InputProvider.INPUTFILE, part=2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    # TODO: fill in example solution
+    run(InputProvider.EXAMPLE, part=1, expectedSolution=157)
+    run(InputProvider.INPUTFILE, part=1)
+    run(InputProvider.EXAMPLE, part=2, expectedSolution=70)
+    run(InputProvider.INPUTFILE, part=2)
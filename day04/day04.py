@@ -2,20 +2,39 @@
 
 from enum import Enum, auto
 import re
+import logging
+import os
+import sys
 
 
-# global variable to make functions more chatty for debugging
-verbose = False
+# the input readers live in the advent2022 package at the top of the
+# repository, which isn't on sys.path when this file is run on its own
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+    sys.path.append(repoRoot)
+from advent2022.mapped import mappedLines
+
+
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day04")
 # parsing each line of input
 # I don't know why pycode style says \d in invalid escape sequence; it's works
 inputLineRegEx = re.compile('(\d+)-(\d+),(\d+)-(\d+)')
 
 
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
+
+
 class InputProvider(Enum):
     """The function getInput() is the star here, giving you the input string to
-    work with."""
+    work with.  MAPPEDFILE gives an iterator over the lines of input.txt
+    instead, for inputs too big to hold in memory."""
     EXAMPLE = auto()
     INPUTFILE = auto()
+    MAPPEDFILE = auto()
 
     def getInput(self) -> str:
         match self:
@@ -29,8 +48,10 @@ class InputProvider(Enum):
 2-6,4-8
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
+            case InputProvider.MAPPEDFILE:
+                return mappedLines(inputFilePath)
 
 
 def run(inputProvider, part=1, expectedSolution=()):
@@ -79,28 +100,34 @@ def overlappingPair(left: InclusiveBounds, right: InclusiveBounds) -> bool:
 
 
 def solve(input, part=1) -> int:
-    splitByLine = input.splitlines()
+    '''input is the whole str, or an iterator of its lines (MAPPEDFILE).'''
+    splitByLine = input
+    if isinstance(input, str):
+        splitByLine = input.splitlines()
     counterForSolution = 0
+    tracing = log.isEnabledFor(logging.DEBUG)
     for line in splitByLine:
         matcher = inputLineRegEx.search(line)
         # I've been comparing strings and not ints!  Convert to ints.
         groups = list(map(lambda s: int(s), matcher.groups()))
-        # if verbose:
-        #     print("solveλ groups after map:", groups)
+        # if tracing:
+        #     log.debug("solveλ groups after map: %s", groups)
         leftRange = InclusiveBounds(groups[0], groups[1])
         rightRange = InclusiveBounds(groups[2], groups[3])
         solveFunction = enclosingPair
         if part == 2:
             solveFunction = overlappingPair
         if solveFunction(leftRange, rightRange):
-            if verbose:
-                print("solveλ MATCH FOUND:",
-                      line, "   ", leftRange, "   ", rightRange)
+            if tracing:
+                log.debug("solveλ MATCH FOUND: %s    %s    %s",
+                          line, leftRange, rightRange)
             counterForSolution += 1
     return counterForSolution
 
 
-run(InputProvider.EXAMPLE, part=1, expectedSolution=2)
-run(InputProvider.INPUTFILE, part=1, expectedSolution=582)
-run(InputProvider.EXAMPLE, part=2, expectedSolution=4)
-run(InputProvider.INPUTFILE, part=2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    run(InputProvider.EXAMPLE, part=1, expectedSolution=2)
+    run(InputProvider.INPUTFILE, part=1, expectedSolution=582)
+    run(InputProvider.EXAMPLE, part=2, expectedSolution=4)
+    run(InputProvider.INPUTFILE, part=2)
@@ -1,10 +1,25 @@
 # Advent of Code 2022 day 05 "Supply Stacks"
 
 from enum import Enum, auto
+from itertools import accumulate, chain
+import array
+import bisect
 import re
+import logging
+import os
 
-# global variable to make functions more chatty for debugging
-verbose = True
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day05")
+
+
+# when tracing, solve() draws about this many frames of the replay at most
+REPLAY_FRAMES = 100
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
@@ -28,16 +43,19 @@ move 2 from 2 to 1
 move 1 from 1 to 2
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
 
 
-def run(inputProvider, part=1, expectedSolution=()):
-    print("Solving part", part, "for", inputProvider)
+def run(inputProvider, part=1, expectedSolution=(), solver=None):
+    '''solver defaults to solve(); solveByTracing, or solve with
+chunked=True, cross-check it.'''
+    solver = solver or solve
+    print("Solving part", part, "for", inputProvider, "by", solver.__name__)
     if (part < 1) or (part > 2):
         raise ValueError("parameter 'part' must be a one or two.")
     finishChar = "🏁"
-    solutionUnderTest = solve(inputProvider.getInput(), part=part)
+    solutionUnderTest = solver(inputProvider.getInput(), part=part)
     if expectedSolution != ():
         if expectedSolution == solutionUnderTest:
             finishChar = "✅"
@@ -47,11 +65,111 @@ def run(inputProvider, part=1, expectedSolution=()):
           "  expected:", str(expectedSolution), "\n")
 
 
-class Dock:
-    '''Ivar: stacks: an [[str]].  As the stack numbers are zero-based, they
-    will be numbered one less than the puzzle input.'''
+class ChunkedStack:
+    '''A stack of crates kept as a list of blocks, bottom block first, so
+moving many crates moves a few blocks instead of every crate.  A block is
+(crates: memoryview, backwards: bool): the crates' ASCII letters bottom to
+top, or top to bottom when backwards, which is how moving crates one at a
+time reverses a whole block without touching it.  Slicing a memoryview
+copies nothing, so neither does splitting a block.  Short blocks are merged
+as they land, so the block count stays near height / MERGE_LENGTH rather
+than growing with every move.'''
+
+    MERGE_LENGTH = 32
+
+    def __init__(self, crates: [str] = ()):
+        self.blocks = list()
+        # tops[i] is the height at the top of blocks[i], for bisecting
+        self.tops = list()
+        if len(crates) > 0:
+            self.putTop([(memoryview(''.join(crates).encode("ascii")),
+                          False)])
+
+    def __len__(self) -> int:
+        return self.tops[-1] if self.tops else 0
+
+    def __getitem__(self, level: int) -> str:
+        '''The crate at level, 0 being the bottom; -1 is the top.'''
+        height = len(self)
+        if level < 0:
+            level += height
+        if not 0 <= level < height:
+            raise IndexError("no level {0} in a stack {1} high"
+                             .format(level, height))
+        i = bisect.bisect_right(self.tops, level)
+        crates, backwards = self.blocks[i]
+        offset = level - (self.tops[i - 1] if i > 0 else 0)
+        return chr(crates[-1 - offset] if backwards else crates[offset])
+
+    def __iter__(self):
+        for crates, backwards in self.blocks:
+            yield from map(chr, reversed(crates) if backwards else crates)
+
+    def takeTop(self, count: int, oneAtATime: bool) -> [(memoryview, bool)]:
+        '''Removes the top count crates and returns them as blocks, bottom
+block first, ready for putTop().  oneAtATime turns them over, the way
+Dock.move does, by reversing the block order and flipping each block's
+backwards flag.  At most one block is split.'''
+        height = len(self)
+        if count > height:
+            raise IndexError("can't take {0} crates off a stack {1} high"
+                             .format(count, height))
+        bottom = height - count     # the height left behind
+        # the first block reaching above bottom, and everything on it
+        i = bisect.bisect_right(self.tops, bottom)
+        taken = self.blocks[i:]
+        del self.blocks[i:]
+        del self.tops[i:]
+        keep = bottom - (self.tops[-1] if self.tops else 0)
+        if keep > 0:
+            # split that block; slicing a memoryview copies nothing
+            crates, backwards = taken[0]
+            if backwards:
+                split = len(crates) - keep
+                self.blocks.append((crates[split:], True))
+                taken[0] = (crates[:split], True)
+            else:
+                self.blocks.append((crates[:keep], False))
+                taken[0] = (crates[keep:], False)
+            self.tops.append(bottom)
+        if oneAtATime:
+            taken.reverse()
+            return [(crates, not backwards) for crates, backwards in taken]
+        return taken
+
+    def putTop(self, blocks: [(memoryview, bool)]):
+        '''Stacks blocks (bottom block first) on top.'''
+        if len(blocks) == 0:
+            return
+        crates, backwards = blocks[0]
+        if self.blocks and len(self.blocks[-1][0]) + len(crates) \
+                <= ChunkedStack.MERGE_LENGTH:
+            topCrates, topBackwards = self.blocks[-1]
+            if topBackwards:
+                topCrates = topCrates[::-1]
+            if backwards:
+                crates = crates[::-1]
+            merged = topCrates.tobytes() + crates.tobytes()
+            self.blocks[-1] = (memoryview(merged), False)
+            self.tops[-1] += len(crates)
+            blocks = blocks[1:]
+        lengths = accumulate((len(crates) for crates, _ in blocks),
+                             initial=len(self))
+        next(lengths)       # that's the height already there
+        self.tops.extend(lengths)
+        self.blocks.extend(blocks)
+
 
-    def __init__(self, stacks: [[str]]):
+class Dock:
+    '''Ivar: stacks: an [[str]], or [ChunkedStack] when chunked.  As the
+    stack numbers are zero-based, they will be numbered one less than the
+    puzzle input.'''
+
+    def __init__(self, stacks: [[str]], chunked: bool = False):
+        self.chunked = chunked
+        if chunked:
+            stacks = [stack if isinstance(stack, ChunkedStack)
+                      else ChunkedStack(stack) for stack in stacks]
         self.stacks = stacks
 
     def stackCount(self) -> int:
@@ -73,90 +191,135 @@ class Dock:
         return output
 
     def move(self, count: int, fromStack: int, toStack: int):
-        if verbose:
-            print("Dock.moveλ {0:>4d}, {1:>4d} ➙ {2:>4d}"\
-                  .format(count, fromStack, toStack))
+        log.debug("Dock.moveλ %4d, %4d ➙ %4d", count, fromStack, toStack)
+        if self.chunked:
+            self.stacks[toStack - 1].putTop(
+                self.stacks[fromStack - 1].takeTop(count, oneAtATime=True))
+            return
         for x in range(0, count):
             cargo = self.stacks[fromStack - 1].pop()
             self.stacks[toStack - 1].append(cargo)
 
     def movePart2(self, count: int, fromStack: int, toStack: int):
-        if verbose:
-            print("Dock.moveλ {0:>4d}, {1:>4d} ➙ {2:>4d}"\
-                  .format(count, fromStack, toStack))
+        log.debug("Dock.moveλ %4d, %4d ➙ %4d", count, fromStack, toStack)
+        if self.chunked:
+            self.stacks[toStack - 1].putTop(
+                self.stacks[fromStack - 1].takeTop(count, oneAtATime=False))
+            return
         # cargo = self.stacks[fromStack - 1].pop(-count)
         # self.stacks[toStack - 1].extend(cargo)
-        cargo = self.stacks[fromStack - 1][-count:]
-        del self.stacks[fromStack - 1][-count:]
+        source = self.stacks[fromStack - 1]
+        # len - count, not -count, which would be the whole stack for 0
+        cargo = source[len(source) - count:]
+        del source[len(source) - count:]
         self.stacks[toStack - 1].extend(cargo)
 
+    def moveAll(self, moves: array.array, oneAtATime: bool):
+        '''Every move of moves, packed (count, fromStack, toStack) triples as
+parseMoves() makes, in one loop: move() when oneAtATime, else
+movePart2().'''
+        stacks = self.stacks
+        triples = zip(moves[0::3], moves[1::3], moves[2::3])
+        if self.chunked:
+            for count, fromStack, toStack in triples:
+                stacks[toStack - 1].putTop(
+                    stacks[fromStack - 1].takeTop(count, oneAtATime))
+        elif oneAtATime:
+            for count, fromStack, toStack in triples:
+                source = stacks[fromStack - 1]
+                # the top count crates, top one first; len - count, not
+                # -count, which would be the whole stack for a count of 0
+                stacks[toStack - 1].extend(source[:-count - 1:-1])
+                del source[len(source) - count:]
+        else:
+            for count, fromStack, toStack in triples:
+                source = stacks[fromStack - 1]
+                top = len(source) - count
+                stacks[toStack - 1].extend(source[top:])
+                del source[top:]
+
+    def prettyString(self) -> str:
+        '''The dock drawn like the puzzle input, with the labels under it.'''
+        # one height per stack, so each cell is a compare, not a search
+        heights = [len(stack) for stack in self.stacks]
+        lines = list()
+        for level in range(max(heights, default=0) - 1, -1, -1):
+            lines.append(''.join(
+                '[{}] '.format(stack[level]) if height > level else '    '
+                for stack, height in zip(self.stacks, heights)))
+        lines.append(''.join('{:^4d}'.format(stackLabel)
+                             for stackLabel in range(1, self.stackCount() + 1)))
+        return '\n'.join(lines)
+
     def prettyPrint(self):
-        for level in range(self.maxStackHeight() - 1, -1, -1):
-            filteredIndexes = []
-            for index, aStack in enumerate(self.stacks):
-                if len(aStack) > level:
-                    filteredIndexes.append(index)
-            for n in range(0, self.stackCount()):
-                if n in filteredIndexes:
-                    oneCharString = self.stacks[n][level]
-                    print('[{}] '.format(oneCharString), end='')
-                else:
-                    # print 4 spaces
-                    print('    ', end='')
-            print()  # end the line
-        for stackLabel in range(1, self.stackCount() + 1):
-            print('{:^4d}'.format(stackLabel), end='')
-        print()  # end the line
+        print(self.prettyString())
+
+
+class DockReplay:
+    '''A record of a run that can be drawn afterwards: the starting stacks,
+one str each, and the moves, packed as parseMoves() makes them.  Only the
+frames asked for are drawn, every `every` moves plus any move numbers in
+frames, plus the last; str() replays the moves on a copy and draws them
+all into one string.'''
+
+    def __init__(self, dock: Dock, moves: array.array, oneAtATime: bool,
+                 every: int = 1, frames: [int] = ()):
+        self.initialStacks = [''.join(stack) for stack in dock.stacks]
+        self.moves = moves
+        self.oneAtATime = oneAtATime
+        self.every = every
+        self.frames = frames
+
+    def frameNumbers(self) -> [int]:
+        '''The moves after which a frame is drawn, in order; 0 is the start.'''
+        moveCount = len(self.moves) // 3
+        numbers = set(range(0, moveCount + 1, max(self.every, 1)))
+        numbers.update(n for n in self.frames if 0 <= n <= moveCount)
+        numbers.add(moveCount)
+        return sorted(numbers)
+
+    def __str__(self) -> str:
+        dock = Dock([list(crates) for crates in self.initialStacks])
+        moves = self.moves
+        pieces = list()
+        done = 0
+        for frame in self.frameNumbers():
+            dock.moveAll(moves[3 * done : 3 * frame], self.oneAtATime)
+            done = frame
+            if frame == 0:
+                pieces.append("initial Dock: =============")
+            else:
+                pieces.append("after move {0}: move {1} from {2} to {3}"
+                              .format(frame, *moves[3 * frame - 3 : 3 * frame]))
+            pieces.append(dock.prettyString())
+        return '\n'.join(pieces)
 
 
 def makeDock(input: [str]) -> Dock:
     '''Creates an Dock instance out of the input strings from the top through
     to the numbered labels under the cargo.  Do not include the "move"
-    lines.'''
-    if verbose:
-        print("makeDockλ parameter input:\n", input)
+    lines.
+
+    Crate letters sit every 4 characters from column 1, so one stride
+    slice (line[1::4]) takes a whole row, and zip() turns the rows into
+    stacks.'''
+    tracing = log.isEnabledFor(logging.DEBUG)
+    if tracing:
+        log.debug("makeDockλ parameter input:\n %s", input)
     labelLine = input.pop()
     MATCHER = re.compile(' ([0-9]+)\s*$')
-    labelMatched = MATCHER.search(labelLine).group()[1]
-    stackCount = int(labelMatched)
-    if verbose:
-        print('🚢 makeDock: ', stackCount)
-
-    myStacks = list()
-    firstCargosLine = input.pop()
-    for stack in range(0, stackCount):
-        startIdx = 4 * stack
-        endIdx = min(startIdx + 4, len(firstCargosLine))
-        lineSlice = firstCargosLine[startIdx:endIdx]
-        lBracket = lineSlice.find('[')
-        newStack = list()
-        if lBracket > -1:
-            rBracket = lineSlice.find(']')
-            assert rBracket > -1
-            cargoIdx = lBracket + 1
-            cargo = lineSlice[cargoIdx:rBracket]
-            newStack = list(cargo)
-        myStacks.append(newStack)
-
-    if verbose:
-        print("myStacks:", myStacks)
-
-    while len(input) > 0:
-        cargosLine = input.pop()
-        for stack in range(0, stackCount):
-            startIdx = 4 * stack
-            if startIdx < len(cargosLine):
-                endIdx = min(startIdx + 4, len(cargosLine))
-                lineSlice = cargosLine[startIdx:endIdx]
-                lBracketIdx = lineSlice.find('[')
-                if lBracketIdx > -1:
-                    rBracketIdx = lineSlice.find(']')
-                    assert rBracketIdx > -1
-                    cargoIdx = lBracket + 1
-                    cargo = lineSlice[cargoIdx:rBracketIdx]
-                    myStacks[stack].append(cargo)
-            if verbose:
-                print("myStacks:", myStacks)
+    stackCount = int(MATCHER.search(labelLine).group(1))
+    log.debug('🚢 makeDock:  %d', stackCount)
+
+    # bottom row first; short lines have no crates on their right
+    rows = [line[1::4].ljust(stackCount) for line in reversed(input)]
+    myStacks = [list(''.join(column).rstrip(' '))
+                for column in zip(*rows)]
+    if len(rows) == 0:
+        myStacks = [list() for _ in range(stackCount)]
+
+    if tracing:
+        log.debug("myStacks: %s", myStacks)
 
     return Dock(myStacks)
 
@@ -180,31 +343,93 @@ class Move:
         return Move(count, fromStack, toStack)
 
 
-def solve(input, part=1) -> str:
-    splitByLines = input.splitlines()
-    splitLineIndex = splitByLines.index('')
+BLANKLINEREGEX = re.compile("\r?\n\r?\n")
+
+
+def parseMoves(moveText: str) -> array.array:
+    '''Every "move N from A to B" in moveText, packed into one array('i')
+as count, fromStack, toStack, count, … by a single regex pass, with no
+Move per line.'''
+    return array.array('i', map(int, chain.from_iterable(
+        Move.MOVELINEREGEX.findall(moveText))))
+
+
+def traceTopCrates(stacks: [[str]], moves: [Move], oneAtATime: bool) -> str:
+    '''Dock.topCrateInEachStack() after moves, without moving any crate.
+Each final top position is followed back through the moves, last move
+first, to the place in stacks where its crate started; the stack heights
+are undone alongside.  oneAtATime is Dock.move, otherwise
+Dock.movePart2.  O(len(moves) × len(stacks)), however many crates move.'''
+    moves = list(moves)
+    heights = [len(stack) for stack in stacks]
+    for move in moves:
+        heights[move.fromStack - 1] -= move.count
+        heights[move.toStack - 1] += move.count
+    # (stack, level) of each crate being followed, as zero-based indexes
+    positions = [[stack, height - 1]
+                 for stack, height in enumerate(heights) if height > 0]
+    for move in reversed(moves):
+        fromStack = move.fromStack - 1
+        toStack = move.toStack - 1
+        # undo the move: the heights from before it
+        heights[fromStack] += move.count
+        heights[toStack] -= move.count
+        toBottom = heights[toStack]
+        for position in positions:
+            if position[0] == toStack and position[1] >= toBottom:
+                above = position[1] - toBottom  # how far up the moved crates
+                position[0] = fromStack
+                if oneAtATime:
+                    position[1] = heights[fromStack] - 1 - above
+                else:
+                    position[1] = heights[fromStack] - move.count + above
+    return ''.join(stacks[stack][level] for stack, level in positions)
+
+
+def solve(input, part=1, chunked=False) -> str:
+    '''chunked moves the crates as ChunkedStack blocks, which pays off once
+moves carry thousands of crates; the real input's moves are a few each.'''
+    # the drawing ends at the first blank line; the moves aren't split up
+    # into lines at all, parseMoves() finds them in the whole input
+    drawing = BLANKLINEREGEX.split(input, maxsplit=1)[0]
     # includes the label string of each line
-    dockLines: [str] = splitByLines[:splitLineIndex]
+    dockLines: [str] = drawing.splitlines()
     # dock = Dock.fromLines(dockLines)
     dock = makeDock(dockLines)
-    if verbose:
-        print("solveλ initial Dock: =============")
-        dock.prettyPrint()
-    moveLines: [str] = splitByLines[splitLineIndex + 1:]
-    moves = map(lambda l: Move.fromString(l), moveLines)
-    movefunc = Dock.move
-    if part == 2:
-        movefunc = Dock.movePart2
-    for move in moves:
-        # dock.move(move.count, move.fromStack, move.toStack)
-        movefunc(dock, move.count, move.fromStack, move.toStack)
-        if verbose:
-            dock.prettyPrint()
+    if chunked:
+        dock = Dock(dock.stacks, chunked=True)
+    moves = parseMoves(input)
+    if log.isEnabledFor(logging.DEBUG):
+        # drawn once, from a replay, rather than after every move
+        every = max(1, len(moves) // 3 // REPLAY_FRAMES)
+        log.debug("solveλ\n%s", DockReplay(dock, moves, part == 1, every))
+    dock.moveAll(moves, oneAtATime=(part == 1))
     return dock.topCrateInEachStack()
 
 
-# TODO: fill in example solution
-# run(InputProvider.EXAMPLE, part=1, expectedSolution='CMZ')
-# run(InputProvider.INPUTFILE, part=1)
-run(InputProvider.EXAMPLE, part=2, expectedSolution='MCD')
-run(InputProvider.INPUTFILE, part=2)
+def solveByTracing(input, part=1) -> str:
+    '''solve(), by traceTopCrates() instead of moving crates.'''
+    splitByLines = input.splitlines()
+    splitLineIndex = splitByLines.index('')
+    dock = makeDock(splitByLines[:splitLineIndex])
+    moves = map(Move.fromString, splitByLines[splitLineIndex + 1:])
+    return traceTopCrates(dock.stacks, moves, oneAtATime=(part == 1))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.DEBUG)
+    def solveChunked(input, part=1) -> str:
+        return solve(input, part=part, chunked=True)
+
+    for solver in (solve, solveByTracing, solveChunked):
+        run(InputProvider.EXAMPLE, part=1, expectedSolution='CMZ',
+            solver=solver)
+        run(InputProvider.EXAMPLE, part=2, expectedSolution='MCD',
+            solver=solver)
+    # the other engines are checked against solve() on the real input
+    logging.getLogger().setLevel(logging.INFO)
+    for part in (1, 2):
+        expected = solve(InputProvider.INPUTFILE.getInput(), part=part)
+        for solver in (solve, solveByTracing, solveChunked):
+            run(InputProvider.INPUTFILE, part=part,
+                expectedSolution=expected, solver=solver)
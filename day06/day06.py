@@ -1,20 +1,45 @@
 # Advent of Code
 
 from enum import Enum, auto
+import logging
+import os
+import sys
 
-# global variable to make functions more chatty for debugging
-verbose = True
+try:
+    import numpy
+except ImportError:     # only findMarkersWithNumpy() needs it
+    numpy = None
+
+
+# the input readers live in the advent2022 package at the top of the
+# repository, which isn't on sys.path when this file is run on its own
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+    sys.path.append(repoRoot)
+from advent2022.mapped import mappedChunks
+
+
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day06")
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
     """The function getInput() is the star here, giving you the input string to
-    work with."""
+    work with.  MAPPEDFILE gives an iterator over chunks of input.txt
+    instead, which solve() scans without ever holding the whole stream."""
     EXAMPLE1 = auto()
     EXAMPLE2 = auto()
     EXAMPLE3 = auto()
     EXAMPLE4 = auto()
     EXAMPLE5 = auto()
     INPUTFILE = auto()
+    MAPPEDFILE = auto()
 
     def getInput(self) -> str:
         match self:
@@ -29,8 +54,10 @@ class InputProvider(Enum):
             case InputProvider.EXAMPLE5:
                 return "zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw"
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
+            case InputProvider.MAPPEDFILE:
+                return mappedChunks(inputFilePath)
 
 
 def run(inputProvider, part=1, expectedSolution=()):
@@ -48,33 +75,145 @@ def run(inputProvider, part=1, expectedSolution=()):
           "  expected:", str(expectedSolution), "\n")
 
 
+def findMarker(chunks, markerWidth: int) -> int:
+    '''How many characters are read by the end of the first markerWidth
+characters that are all different, or None if there are none.  chunks is
+any iterable of str pieces of the stream; a window can straddle pieces.
+Per-character counts and the number of distinct characters in the window
+are updated as it slides, so each character costs O(1), and only the
+last markerWidth characters are kept between chunks.'''
+    if markerWidth < 1:
+        raise ValueError("parameter 'markerWidth' must be at least one.")
+    counts = dict()     # character → how many times it's in the window
+    distinct = 0        # how many counts are not zero
+    carry = ''          # the end of the previous chunks, for the window
+    position = 0
+    for chunk in chunks:
+        window = carry + chunk
+        for i in range(len(carry), len(window)):
+            if i >= markerWidth:
+                leaving = window[i - markerWidth]
+                counts[leaving] -= 1
+                if counts[leaving] == 0:
+                    distinct -= 1
+            arriving = window[i]
+            count = counts.get(arriving, 0)
+            if count == 0:
+                distinct += 1
+            counts[arriving] = count + 1
+            position += 1
+            if distinct == markerWidth:
+                return position
+        carry = window[-markerWidth:]
+    return None
+
+
+def streamsAsNumpy(streams) -> ("numpy.ndarray", "numpy.ndarray"):
+    '''streams (str or bytes each) as one 2D uint8 array, one row per stream
+padded with zeros, and the length of each.  A 2D array comes back as is,
+each row its full width.'''
+    if isinstance(streams, numpy.ndarray):
+        rows = streams.astype(numpy.uint8, copy=False)
+        if rows.ndim != 2:
+            raise ValueError("expected a 2D array of streams, not {0}D"
+                             .format(rows.ndim))
+        return rows, numpy.full(rows.shape[0], rows.shape[1])
+    encoded = [stream.encode("ascii") if isinstance(stream, str) else stream
+               for stream in streams]
+    lengths = numpy.array([len(stream) for stream in encoded], dtype=numpy.intp)
+    rows = numpy.zeros((len(encoded), max(lengths, default=0)),
+                       dtype=numpy.uint8)
+    for row, stream in zip(rows, encoded):
+        row[:len(stream)] = numpy.frombuffer(stream, dtype=numpy.uint8)
+    return rows, lengths
+
+
+def findMarkersWithNumpy(streams, markerWidths=(4, 14)) -> "numpy.ndarray":
+    '''findMarker() of every stream for every width at once; needs numpy.
+streams is a list of str or bytes, or a 2D uint8 array with one stream per
+row.  Returns an array of len(streams) × len(markerWidths), -1 where a
+stream has no marker of that width.
+
+For each position, the last earlier position holding the same character
+comes from one stable sort of (stream, character) keys: equal keys end up
+next to each other in position order.  The window of distinct characters
+ending at a position starts just after the latest of those up to it, one
+numpy.maximum.accumulate, so every stream and every width is answered
+from the same two arrays.'''
+    if numpy is None:
+        raise ImportError("findMarkersWithNumpy() needs numpy, which isn't "
+                          "installed; findMarker() doesn't.")
+    rows, lengths = streamsAsNumpy(streams)
+    count, width = rows.shape
+    output = numpy.full((count, len(markerWidths)), -1, dtype=numpy.intp)
+    if width == 0:
+        return output
+    keys = (numpy.arange(count, dtype=numpy.int64)[:, numpy.newaxis] * 256
+            + rows).ravel()
+    order = numpy.argsort(keys, kind="stable")
+    sameKey = keys[order[1:]] == keys[order[:-1]]
+    previous = numpy.full(keys.size, -1, dtype=numpy.intp)
+    previous[order[1:][sameKey]] = order[:-1][sameKey] % width
+    previous = previous.reshape(rows.shape)
+    positions = numpy.arange(width)
+    windowStart = numpy.maximum.accumulate(previous + 1, axis=1)
+    distinctRun = positions - windowStart + 1
+    # the zero padding after a stream's end is never part of a marker
+    inStream = positions < lengths[:, numpy.newaxis]
+    for column, markerWidth in enumerate(markerWidths):
+        isMarkerEnd = (distinctRun >= markerWidth) & inStream
+        found = isMarkerEnd.any(axis=1)
+        output[found, column] = isMarkerEnd[found].argmax(axis=1) + 1
+    return output
+
+
 def solve(input, part=1) -> int:
+    '''input is the stream as a str, or an iterator of str chunks of it.
+None when there's no marker.'''
     markerWidth = 4
     if part == 2:
         markerWidth = 14
-    windowEnd = markerWidth - 1
-    foundStartOfPacketMarker = False
-    while not foundStartOfPacketMarker:
-        windowEnd = windowEnd + 1
-        windowStart = windowEnd - markerWidth
-        substring = input[windowStart : windowEnd]
-        windowSet = set(substring)
-        if len(windowSet) == markerWidth:
-            foundStartOfPacketMarker = True
-    return windowEnd
-
-
-
-# TODO: fill in example solution
-run(InputProvider.EXAMPLE1, part=1, expectedSolution=7)
-run(InputProvider.EXAMPLE2, part=1, expectedSolution=5)
-run(InputProvider.EXAMPLE3, part=1, expectedSolution=6)
-run(InputProvider.EXAMPLE4, part=1, expectedSolution=10)
-run(InputProvider.EXAMPLE5, part=1, expectedSolution=11)
-run(InputProvider.INPUTFILE, part=1, expectedSolution=1531)
-run(InputProvider.EXAMPLE1, part=2, expectedSolution=19)
-run(InputProvider.EXAMPLE2, part=2, expectedSolution=23)
-run(InputProvider.EXAMPLE3, part=2, expectedSolution=23)
-run(InputProvider.EXAMPLE4, part=2, expectedSolution=29)
-run(InputProvider.EXAMPLE5, part=2, expectedSolution=26)
-run(InputProvider.INPUTFILE, part=2)
+    if isinstance(input, str):
+        input = [input]
+    position = findMarker(input, markerWidth)
+    if position is None:
+        log.warning("No marker %d characters wide.", markerWidth)
+    return position
+
+
+def runWithNumpy(inputProviders, expectedSolutions):
+    '''findMarkersWithNumpy() over every input at once, checked against
+expectedSolutions, one (part 1, part 2) pair per input.'''
+    print("Solving both parts for", len(inputProviders), "inputs with numpy")
+    if numpy is None:
+        print("🏁 skipped: numpy isn't installed\n")
+        return
+    found = findMarkersWithNumpy(
+        [inputProvider.getInput() for inputProvider in inputProviders])
+    for inputProvider, solutions, expected in \
+            zip(inputProviders, found.tolist(), expectedSolutions):
+        finishChar = "✅" if tuple(solutions) == tuple(expected) else "❌"
+        print(finishChar, inputProvider, "found:", tuple(solutions),
+              "  expected:", tuple(expected))
+    print()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.DEBUG)
+    # TODO: fill in example solution
+    run(InputProvider.EXAMPLE1, part=1, expectedSolution=7)
+    run(InputProvider.EXAMPLE2, part=1, expectedSolution=5)
+    run(InputProvider.EXAMPLE3, part=1, expectedSolution=6)
+    run(InputProvider.EXAMPLE4, part=1, expectedSolution=10)
+    run(InputProvider.EXAMPLE5, part=1, expectedSolution=11)
+    run(InputProvider.INPUTFILE, part=1, expectedSolution=1531)
+    run(InputProvider.EXAMPLE1, part=2, expectedSolution=19)
+    run(InputProvider.EXAMPLE2, part=2, expectedSolution=23)
+    run(InputProvider.EXAMPLE3, part=2, expectedSolution=23)
+    run(InputProvider.EXAMPLE4, part=2, expectedSolution=29)
+    run(InputProvider.EXAMPLE5, part=2, expectedSolution=26)
+    run(InputProvider.INPUTFILE, part=2)
+    runWithNumpy([InputProvider.EXAMPLE1, InputProvider.EXAMPLE2,
+                  InputProvider.EXAMPLE3, InputProvider.EXAMPLE4,
+                  InputProvider.EXAMPLE5],
+                 [(7, 19), (5, 23), (6, 23), (10, 29), (11, 26)])
@@ -1,7 +1,29 @@
 # Advent of Code 2022 Day 07
 
-from itertools import repeat
-from functools import reduce
+from itertools import accumulate, repeat
+import array
+import bisect
+import logging
+import os
+import sys
+
+
+# the input readers live in the advent2022 package at the top of the
+# repository, which isn't on sys.path when this file is run on its own
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+    sys.path.append(repoRoot)
+from advent2022.mapped import mappedLines
+
+
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day07")
+
+# the puzzle's numbers, which solve() takes as parameters for what-ifs
+SMALL_DIRECTORY_LIMIT = 100000
+DISK_SPACE_TOTAL = 70000000
+UPDATE_SPACE_NEEDED = 30000000
 
 # protocol FSNode
 #   var name: String { get }
@@ -21,21 +43,67 @@ class Directory:
     def __init__(self, name: str):
         self.name = name
         self.contents = list()
+        # the same nodes as contents, by name, so `cd` doesn't search
+        self.children = dict()
         self.parent = None
+        # the total size of everything under here, once computeSizes() ran;
+        # None until then.  A cached directory's subdirectories are all
+        # cached too, so add() can stop at the first uncached ancestor.
+        self.cachedSize = None
 
     def getSize(self) -> int:
-        output = 0
-        for fsnode in self.contents:
-            output += fsnode.getSize()
-        return output
+        if self.cachedSize is None:
+            self.computeSizes()
+        return self.cachedSize
+
+    def computeSizes(self):
+        '''Cache the size of this directory and every directory under it,
+in one post-order pass without recursion, so deep trees are fine.'''
+        stack = [(self, False)]
+        while stack:
+            directory, childrenDone = stack.pop()
+            if childrenDone:
+                size = 0
+                for fsnode in directory.contents:
+                    size += fsnode.getSize()   # cached by now, if a Directory
+                directory.cachedSize = size
+            else:
+                stack.append((directory, True))
+                for fsnode in directory.contents:
+                    if type(fsnode) is Directory and fsnode.cachedSize is None:
+                        stack.append((fsnode, False))
+
+    def walk(self):
+        '''This directory and every directory under it, parents first.'''
+        stack = [self]
+        while stack:
+            directory = stack.pop()
+            yield directory
+            for fsnode in reversed(directory.contents):
+                if type(fsnode) is Directory:
+                    stack.append(fsnode)
 
     def add(self, newNode):
+        '''Returns the node now in this directory by newNode's name, which
+is the one already there when a repeated `ls` lists it again.'''
+        existingNode = self.children.get(newNode.name)
+        if existingNode is not None:
+            return existingNode
         # if newNode is Directory:
         #     newNode.parent = self
         #  above just checks identity
         if type(newNode) is Directory:
             newNode.parent = self
         self.contents.append(newNode)
+        self.children[newNode.name] = newNode
+        if self.cachedSize is not None:
+            # keep the cached sizes up to date, instead of dropping them
+            addedSize = newNode.getSize()
+            ancestor = self
+            while ancestor is not None and ancestor.cachedSize is not None:
+                ancestor.cachedSize += addedSize
+                ancestor = ancestor.parent
+        return newNode
 
     def prettyPrint(self, indentLevel: int = 0):
         indent = ''.join(repeat(' ', 4 * indentLevel))
@@ -54,18 +122,9 @@ class Directory:
                 print(indent, '    ', fsnode.name, '\t', str(fsnode.getSize()))
 
 
-def getDirectoriesUnder100000(rootDir: Directory):
-    output = list()
-    if rootDir.getSize() < 100000:
-        output.append(rootDir)
-    for node in rootDir.contents:
-        if type(node) is Directory:
-            output += getDirectoriesUnder100000(node)
-    return output
-
-
 def parse(input: str) -> Directory:
-    splitByLine = input.splitlines()
+    '''input is the transcript as a str, or any iterable of its lines.'''
+    splitByLine = input.splitlines() if isinstance(input, str) else input
     root = Directory("/")
     pwd: Directory = root
     for line in splitByLine:
@@ -79,14 +138,16 @@ def parse(input: str) -> Directory:
                                 pwd = root
                             case "..":
                                 if not pwd.parent:
-                                    print("No parent.  pwd:", pwd.name)
-                                    print("line:", line)
+                                    log.warning("No parent.  pwd: %s"
+                                                "  line: %s", pwd.name, line)
                                 pwd = pwd.parent
                             case _:
-                                for fd in pwd.contents:
-                                    if fd.name == splitBySpace[2]:
-                                        pwd = fd
-                                        break
+                                child = pwd.children.get(splitBySpace[2])
+                                if type(child) is Directory:
+                                    pwd = child
+                                else:
+                                    log.warning("No such directory.  pwd: %s"
+                                                "  line: %s", pwd.name, line)
                     case "ls":
                         continue
             case "dir":
@@ -98,9 +159,119 @@ def parse(input: str) -> Directory:
     return root
 
 
+def streamDirectorySizes(lines, trackRevisits: bool = False):
+    '''Yields (path, total size) for each directory of the transcript as it
+is left, straight from lines (any iterable of lines), without building any
+File or Directory.  The stack holds one [path, running total, listed,
+revisit] per directory from / down to the current one, so memory is
+O(depth) however long the transcript is.  A second ls of an open directory
+is ignored, with a warning.
+By default each directory is assumed to be visited once, as the real
+transcripts do, and a cd back into one already left counts its listing
+again.  trackRevisits keeps the path of every directory left, one path per
+directory rather than O(depth), so such a cd is warned about and everything
+under it ignored until it's left again; a total can't be taken back once
+yielded.  While a revisit only lists what was already there, that agrees
+with what parse and Directory.add make of it; a file first seen on a
+revisit is counted by parse but not here.'''
+    stack = list()
+    closed = set() if trackRevisits else None
+    counting = True
+
+    def leave():
+        path, total, _, revisit = stack.pop()
+        if revisit:
+            return None
+        if closed is not None:
+            closed.add(path)
+        if stack:
+            stack[-1][1] += total
+        return (path, total)
+
+    for line in lines:
+        if line.startswith("$ cd "):
+            name = line[5:]
+            if name == "/":
+                while len(stack) > 1:
+                    left = leave()
+                    if left is not None:
+                        yield left
+                if not stack:
+                    stack.append(["/", 0, False, False])
+            elif name == "..":
+                if len(stack) > 1:
+                    left = leave()
+                    if left is not None:
+                        yield left
+                else:
+                    log.warning("No parent.  line: %s", line)
+            else:
+                parentPath = stack[-1][0] if stack else ""
+                parentRevisit = stack[-1][3] if stack else False
+                if parentPath == "/":
+                    parentPath = ""
+                path = parentPath + "/" + name
+                revisit = parentRevisit or \
+                    (closed is not None and path in closed)
+                if revisit and not parentRevisit:
+                    log.warning("%s was already left; ignoring it this time."
+                                "  line: %s", path, line)
+                stack.append([path, 0, False, revisit])
+                counting = not revisit
+        elif line == "$ ls":
+            top = stack[-1]
+            counting = not (top[2] or top[3])
+            if top[2] and not top[3]:
+                log.warning("%s was already listed; ignoring it this time.",
+                            top[0])
+            top[2] = True
+        elif line.startswith("$") or line.startswith("dir ") or not line:
+            continue
+        elif counting:
+            size, _, _ = line.partition(" ")
+            stack[-1][1] += int(size)
+    while stack:
+        left = leave()
+        if left is not None:
+            yield left
+
+
+def solveStreaming(lines, part: int = 1,
+                   smallDirectoryLimit: int = SMALL_DIRECTORY_LIMIT,
+                   diskSpaceTotal: int = DISK_SPACE_TOTAL,
+                   updateSpaceNeeded: int = UPDATE_SPACE_NEEDED,
+                   trackRevisits: bool = False) -> int:
+    '''solve() over streamDirectorySizes(lines, trackRevisits).  Part 1 keeps nothing but
+the running sum; part 2 can't know how much to free until / is closed, so
+it keeps every directory's size, but only as an int in an array.'''
+    if part == 1:
+        return sum(total for _, total in streamDirectorySizes(lines, trackRevisits)
+                   if total < smallDirectoryLimit)
+    elif part == 2:
+        sizes = array.array('q')
+        rootSize = 0
+        for path, total in streamDirectorySizes(lines, trackRevisits):
+            sizes.append(total)
+            rootSize = total    # / is always closed last
+        spaceToFreeUp = updateSpaceNeeded - (diskSpaceTotal - rootSize)
+        minDirSize = min((size for size in sizes if size >= spaceToFreeUp),
+                         default=None)
+        if minDirSize is None:
+            log.warning("No directory is at least %d; deleting one can't "
+                        "free enough space.", spaceToFreeUp)
+        return minDirSize
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
+
+
 class InputProvider:
     EXAMPLE = 0
     FILE = 1
+    # input.txt as an iterator of lines
+    MAPPEDFILE = 2
     EXAMPLE_STRING = """$ cd /
 $ ls
 dir a
@@ -131,57 +302,242 @@ $ ls
             case InputProvider.EXAMPLE:
                 return InputProvider.EXAMPLE_STRING
             case InputProvider.FILE:
-                file = open("input.txt")
-                contents = file.read()
+                with open(inputFilePath) as file:
+                    contents = file.read()
                 return contents
+            case InputProvider.MAPPEDFILE:
+                return mappedLines(inputFilePath)
             case _:
                 raise Exception("Bad parameter.")
 
 
-def getDirectoriesAtLeast(rootDir: Directory, spaceToFreeUp: int):
-    output = list()
-    if rootDir.getSize() >= spaceToFreeUp:
-        output.append(rootDir)
-    for node in rootDir.contents:
-        if type(node) is Directory:
-            output += getDirectoriesAtLeast(node, spaceToFreeUp)
-    return output
+class NodeStore:
+    '''A whole filesystem in parallel array('q') columns, one row per File or
+Directory, instead of one Python object each.  Row 0 is /, and a parent's
+row always comes before its children's.
+parent, size, kind, firstChild, nextSibling, nameId: array('q'), with -1
+for "none" and kind FILE_KIND or DIRECTORY_KIND; names: [str], each
+distinct name once, which nameId indexes into.  A directory's size is its
+total once rollUpSizes() has run.'''
+
+    FILE_KIND = 0
+    DIRECTORY_KIND = 1
 
+    def __init__(self):
+        self.parent = array.array('q')
+        self.size = array.array('q')
+        self.kind = array.array('q')
+        self.firstChild = array.array('q')
+        self.nextSibling = array.array('q')
+        self.nameId = array.array('q')
+        self.names = list()
+        self._nameIds = dict()   # name → its index in names
 
-def solve(input: str, part: int = 1) -> int:
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def append(self, name: str, kind: int, size: int = 0,
+               parent: int = -1) -> int:
+        '''Adds a row and returns its index.  Children are linked in at the
+front of parent's list, so append them last one first to keep order.'''
+        nameId = self._nameIds.get(name)
+        if nameId is None:
+            nameId = self._nameIds[name] = len(self.names)
+            self.names.append(name)
+        index = len(self.kind)
+        self.parent.append(parent)
+        self.size.append(size)
+        self.kind.append(kind)
+        self.firstChild.append(-1)
+        self.nameId.append(nameId)
+        if parent >= 0:
+            self.nextSibling.append(self.firstChild[parent])
+            self.firstChild[parent] = index
+        else:
+            self.nextSibling.append(-1)
+        return index
+
+    @classmethod
+    def fromDirectory(Cls, root: Directory):
+        '''Copies the tree under root, each directory's children in their
+order, and rolls up the directory sizes.'''
+        store = Cls()
+        stack = [(root, store.append(root.name, Cls.DIRECTORY_KIND))]
+        while stack:
+            directory, index = stack.pop()
+            for fsnode in reversed(directory.contents):
+                if type(fsnode) is Directory:
+                    child = store.append(fsnode.name, Cls.DIRECTORY_KIND,
+                                         parent=index)
+                    stack.append((fsnode, child))
+                else:
+                    store.append(fsnode.name, Cls.FILE_KIND, fsnode.size,
+                                 parent=index)
+        store.rollUpSizes()
+        return store
+
+    def rollUpSizes(self):
+        '''Adds every row's size into its parent's, children before parents,
+which is just the rows backwards.  Run it once, on file sizes only.'''
+        parent = self.parent
+        size = self.size
+        for index in range(len(size) - 1, 0, -1):
+            size[parent[index]] += size[index]
+
+    def children(self, index: int):
+        child = self.firstChild[index]
+        while child >= 0:
+            yield child
+            child = self.nextSibling[child]
+
+    def name(self, index: int) -> str:
+        return self.names[self.nameId[index]]
+
+    def path(self, index: int) -> str:
+        parts = list()
+        while index > 0:
+            parts.append(self.name(index))
+            index = self.parent[index]
+        return "/" + "/".join(reversed(parts))
+
+    def directoriesBelow(self, threshold: int) -> [int]:
+        '''Rows of the directories smaller than threshold.'''
+        directoryKind = NodeStore.DIRECTORY_KIND
+        return [index for index, (kind, size)
+                in enumerate(zip(self.kind, self.size))
+                if kind == directoryKind and size < threshold]
+
+    def smallestDirectoryAtLeast(self, minimum: int) -> int:
+        '''Row of the smallest directory of at least minimum, or -1.'''
+        directoryKind = NodeStore.DIRECTORY_KIND
+        best = -1
+        bestSize = 0
+        for index, (kind, size) in enumerate(zip(self.kind, self.size)):
+            if kind == directoryKind and size >= minimum and \
+               (best < 0 or size < bestSize):
+                best = index
+                bestSize = size
+        return best
+
+
+class SizeIndex:
+    '''Every directory's size, sorted, with the directory's path at the same
+position, plus running totals; built once, then each query is a bisection.
+sizes: array('q'); paths: [str]; sums: array('q'), sums[i] being the total
+of sizes[:i].'''
+
+    def __init__(self, pathsAndSizes):
+        '''pathsAndSizes: (path, size) pairs in any order, such as
+streamDirectorySizes() yields.'''
+        ordered = sorted(pathsAndSizes, key=lambda pair: pair[1])
+        self.paths = [path for path, _ in ordered]
+        self.sizes = array.array('q', (size for _, size in ordered))
+        self.sums = array.array('q', accumulate(self.sizes, initial=0))
+
+    @classmethod
+    def fromDirectory(Cls, root: Directory):
+        pathsAndSizes = list()
+        stack = [(root, "/")]
+        while stack:
+            directory, path = stack.pop()
+            pathsAndSizes.append((path, directory.getSize()))
+            prefix = "" if path == "/" else path
+            for fsnode in directory.contents:
+                if type(fsnode) is Directory:
+                    stack.append((fsnode, prefix + "/" + fsnode.name))
+        return Cls(pathsAndSizes)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def below(self, threshold: int) -> [(str, int)]:
+        '''(path, size) of every directory smaller than threshold, smallest
+first.'''
+        end = bisect.bisect_left(self.sizes, threshold)
+        return list(zip(self.paths[:end], self.sizes[:end]))
+
+    def sumBelow(self, threshold: int) -> int:
+        return self.sums[bisect.bisect_left(self.sizes, threshold)]
+
+    def smallestAtLeast(self, minimum: int) -> (str, int):
+        '''(path, size) of the smallest directory of at least minimum, or
+None when none is that big.'''
+        i = bisect.bisect_left(self.sizes, minimum)
+        if i == len(self.sizes):
+            return None
+        return (self.paths[i], self.sizes[i])
+
+    def largest(self, k: int) -> [(str, int)]:
+        '''(path, size) of the k largest directories, largest first.'''
+        start = max(len(self.sizes) - k, 0)
+        return list(zip(reversed(self.paths[start:]),
+                        reversed(self.sizes[start:])))
+
+
+def solve(input: str, part: int = 1,
+          smallDirectoryLimit: int = SMALL_DIRECTORY_LIMIT,
+          diskSpaceTotal: int = DISK_SPACE_TOTAL,
+          updateSpaceNeeded: int = UPDATE_SPACE_NEEDED,
+          streaming: bool = False, trackRevisits: bool = False) -> int:
+    '''input is the transcript as a str, or an iterator of its lines; either
+way it's parsed into the tree unless streaming is True, when it goes to
+solveStreaming instead.  The streaming answer assumes each directory is
+visited once unless trackRevisits is also True, and even then a file first
+listed when a directory is revisited is only counted by the tree (see
+streamDirectorySizes).  Part 2 is None, with a warning, when no single
+directory frees enough space.'''
+    if streaming:
+        lines = input.splitlines() if isinstance(input, str) else input
+        return solveStreaming(lines, part, smallDirectoryLimit,
+                              diskSpaceTotal, updateSpaceNeeded,
+                              trackRevisits)
     root = parse(input)
+    sizeIndex = SizeIndex.fromDirectory(root)
     if part == 1:
-        print("--------------------- Finished parsing input. ------------------")
-        dirsUnder100k = getDirectoriesUnder100000(root)
-        print("Directories < 100k:")
-        for d in dirsUnder100k:
-            print("    {0:>8}  {1}".format(d.getSize(), d.name))
-        dirsUnder100kSizes = map(lambda x: x.getSize(), dirsUnder100k)
-        sumDirsUnder100k = reduce(lambda lhs, rhs: lhs+rhs,
-                                  dirsUnder100kSizes)
-        return sumDirsUnder100k
+        log.info("--------------------- Finished parsing input. ------------------")
+        if log.isEnabledFor(logging.INFO):
+            log.info("Directories < %d:", smallDirectoryLimit)
+            for path, size in sizeIndex.below(smallDirectoryLimit):
+                log.info("    %8d  %s", size, path)
+        return sizeIndex.sumBelow(smallDirectoryLimit)
     elif part == 2:
-        diskSpaceTotal = 70000000
-        updateSpaceNeeded = 30000000
         spaceCurrentlyFree = diskSpaceTotal - root.getSize()
         spaceToFreeUp = updateSpaceNeeded - spaceCurrentlyFree
-        print("--------------------- Finished parsing input. ------------------")
-        print("free space (total disk space - root.getSize()):", spaceCurrentlyFree)
-        print("space to free up (updateSpaceNeeded - free space):", spaceToFreeUp)
-        dirsAtLeastX = getDirectoriesAtLeast(root, spaceToFreeUp)
-        print("Directories at least {0}:".format(spaceToFreeUp))
-        for d in dirsAtLeastX:
-            print("    {0:>8}  {1}".format(d.getSize(), d.name))
-        minDir = min(dirsAtLeastX, key=Directory.getSize)
-        minDirSize = minDir.getSize()
-        print("The minumum directory is", minDir.name, "at size:", minDirSize)
-        # dirsAtLeastXSizes = map(lambda x: x.getSize(), dirsAtLeastX)
-        # sumDirs = reduce(lambda lhs, rhs: lhs+rhs, dirsAtLeastXSizes)
+        log.info("--------------------- Finished parsing input. ------------------")
+        log.info("free space (total disk space - root.getSize()): %d", spaceCurrentlyFree)
+        log.info("space to free up (updateSpaceNeeded - free space): %d", spaceToFreeUp)
+        smallest = sizeIndex.smallestAtLeast(spaceToFreeUp)
+        if smallest is None:
+            log.warning("No directory is at least %d; deleting one can't "
+                        "free enough space.", spaceToFreeUp)
+            return None
+        minPath, minDirSize = smallest
+        log.info("The minumum directory is %s at size: %d", minPath, minDirSize)
         return minDirSize
 
 
-def run(input: str, part: int = 1, expectedSolution=()):
-    foundSolution = solve(input, part)
+def solveByNodeStore(input: str, part: int = 1,
+                     smallDirectoryLimit: int = SMALL_DIRECTORY_LIMIT,
+                     diskSpaceTotal: int = DISK_SPACE_TOTAL,
+                     updateSpaceNeeded: int = UPDATE_SPACE_NEEDED) -> int:
+    '''solve(), answered from a NodeStore copy of the tree rather than a
+SizeIndex.'''
+    store = NodeStore.fromDirectory(parse(input))
+    if part == 1:
+        return sum(store.size[index]
+                   for index in store.directoriesBelow(smallDirectoryLimit))
+    elif part == 2:
+        spaceToFreeUp = updateSpaceNeeded - (diskSpaceTotal - store.size[0])
+        smallest = store.smallestDirectoryAtLeast(spaceToFreeUp)
+        if smallest < 0:
+            log.warning("No directory is at least %d; deleting one can't "
+                        "free enough space.", spaceToFreeUp)
+            return None
+        return store.size[smallest]
+
+
+def run(input: str, part: int = 1, expectedSolution=(), solver=solve):
+    foundSolution = solver(input, part)
     solvedIcon = '🏁'
     expectedSolutionString = ''
     if expectedSolution:
@@ -193,7 +549,13 @@ def run(input: str, part: int = 1, expectedSolution=()):
     print(solvedIcon, "answer:", foundSolution, expectedSolutionString)
 
 
-# run(InputProvider.getInput(InputProvider.EXAMPLE), 1, 95437)
-# run(InputProvider.getInput(InputProvider.FILE), 1, 1770595)
-# run(InputProvider.getInput(InputProvider.EXAMPLE), 2, 24933642)
-run(InputProvider.getInput(InputProvider.FILE), 2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    # run(InputProvider.getInput(InputProvider.EXAMPLE), 1, 95437)
+    # run(InputProvider.getInput(InputProvider.FILE), 1, 1770595)
+    # run(InputProvider.getInput(InputProvider.EXAMPLE), 2, 24933642)
+    run(InputProvider.getInput(InputProvider.FILE), 2)
+    run(InputProvider.getInput(InputProvider.EXAMPLE), 1, 95437,
+        solver=solveByNodeStore)
+    run(InputProvider.getInput(InputProvider.EXAMPLE), 2, 24933642,
+        solver=solveByNodeStore)
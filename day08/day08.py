@@ -3,12 +3,33 @@
 
 from enum import Enum, auto
 from functools import reduce
-from more_itertools import grouper
 import array
+import logging
+import os
+import sys
 
+try:
+    import numpy
+except ImportError:     # the pure Python functions below still work
+    numpy = None
 
-# global variable to make functions more chatty for debugging
-verbose = False
+
+# the grid lives in the advent2022 package at the top of the repository,
+# which isn't on sys.path when this file is run on its own
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+    sys.path.append(repoRoot)
+from advent2022.grid import Coordinate, Grid_int
+
+
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day08")
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
@@ -28,8 +49,8 @@ class InputProvider(Enum):
 35390
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
 
 
 def run(inputProvider, part=1, expectedSolution=()):
@@ -67,119 +88,12 @@ class Direction(Enum):
                 return Coordinate(0, -1)
 
 
-class Coordinate:
-
-    def __init__(self, y: int, x: int):
-        self.y = y
-        self.x = x
-
-    def __iadd__(self, other):
-        # self.y += other.y
-        # self.x += other.x
-        newCoord = Coordinate(self.y + other.y, self.x + other.x)
-        return newCoord
-
-    def __add__(lhs, rhs):
-        return Coordinate(lhs.y + rhs.y, lhs.x + rhs.x)
-
-    def __str__(self):
-        return "✦(y:{0},x:{1})".format(self.y, self.x)
-
-    def __eq__(self, other) -> bool:
-        return (self.y == other.y) and (self.x == other.x)
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-
-class Grid_int:
-    '''An Array of integers indexable by Coordinates.
-height: int; width: int; grid: [int] (is flattened 2D array)'''
-
-    def __init__(self, height: int, width: int, grid: [int]):
-        assert (width * height) == len(grid),\
-            "w:{0} × h:{1} != len(grid):{2}".format(width, height, len(grid))
-        self.height = height
-        self.width = width
-        self.grid = grid
-
-    @classmethod
-    def makeGrid(Cls, array2D: [[int]]):
-        '''Make an Int2DGrid from a 2D array of int's.'''
-        widths = map(lambda a: len(a), array2D)
-        widthsSet = set(widths)
-        assert len(widthsSet) == 1
-        width = widthsSet.pop()
-        height = len(array2D)
-        flattened = array.array('i')
-        for innerList in array2D:
-            flattened.extend(innerList)
-        assert (width * height) == len(flattened)
-        output = Grid_int.__init__(height, width, flattened)
-        return output
-
-    def _makeIndex(self, coordinate: Coordinate) -> int:
-        '''Flatten a Coordinate into a single int index to subscript into
-self.grid with.'''
-        index = (coordinate.y * self.width) + coordinate.x
-        assert index < len(self.grid)
-        return index
-
-    def __getitem__(self, idx):
-        if type(idx) is Coordinate:
-            return self.grid[self._makeIndex(idx)]
-        elif type(idx) is int:
-            return self.grid[idx]
-        else:
-            raise Exception("Invalid index type; expected Coordinate or int,\
-            not: {0}.".format(type(idx)))
-
-    def __setitem__(self, idx, newValue: int):
-        if type(idx) is Coordinate:
-            self.grid[self._makeIndex(idx)] = newValue
-        elif type(idx) is int:
-            self.grid[idx] = newValue
-        else:
-            raise Exception("Invalid index type; expected Coordinate or int,\
-            not: {0}.".format(type(idx)))
-
-    def __len__(self) -> int:
-        return len(self.grid)
-
-    def isCoordInBounds(self, coord: Coordinate) -> bool:
-        yValueOK = (coord.y < self.height) and (coord.y >= 0)
-        xValueOK = (coord.x < self.width)  and (coord.x >= 0)
-        return yValueOK and xValueOK
-
-    def __str__(self) -> str:
-        chunks = list(grouper(self.grid, self.width))
-        lines: [str] = list()
-        for i in range(0, len(chunks)):
-            chunk = chunks[i]
-            line = str()
-            if i == 0:
-                line = '['
-            else:
-                line = ' ['
-            # line += ', '.join(map(lambda i: str(i), chunk))
-            line += ', '.join(map(lambda i: "{0:>2}".format(i), chunk))
-            line += ']'
-            lines.append(line)
-        output = '[' + ',\n'.join(lines) + ']\n'
-        return output
-
-    def allCoordinates(self) -> [Coordinate]:
-        '''All valid coordinates of this 2D array.'''
-        return [Coordinate(y, x)
-                for y in range(0, self.height)
-                for x in range(0, self.width)]
-
-
 def areAllCoordsLessThan(grid_int: Grid_int, coords: [Coordinate],
                          treeHeight: int) -> bool:
-    if verbose:
+    if log.isEnabledFor(logging.DEBUG):
         coordStr = '[' + ','.join(map(lambda c: str(c), coords)) + ']'
-        print("λareAllCoordsLessThan treeHeight:", treeHeight, "coords:", coordStr)
+        log.debug("λareAllCoordsLessThan treeHeight: %d coords: %s",
+                  treeHeight, coordStr)
     output = True
     for c in coords:
         if grid_int[c] >= treeHeight:
@@ -194,25 +108,15 @@ def isVisibleFromOutside(grid_int: Grid_int, coordinate) -> bool:
         return True
     if (coordinate.y == 0) or (coordinate.y == (grid_int.height - 1)):
         return True
-    # check heights
-    toTopEdgeYrange  = range(0, coordinate.y)
-    toTopEdge = list(map(lambda y: Coordinate(y, coordinate.x), toTopEdgeYrange))
-    toBotEdgeYrange  = range(coordinate.y + 1, grid_int.height)
-    toBotEdge = list(map(lambda y: Coordinate(y, coordinate.x), toBotEdgeYrange))
-    toWestEdgeXrange = range(0, coordinate.x)
-    toWestEdge = list(map(lambda x: Coordinate(coordinate.y, x), toWestEdgeXrange))
-    toEastEdgeXrange = range(coordinate.x + 1, grid_int.width)
-    toEastEdge = list(map(lambda x: Coordinate(coordinate.y, x), toEastEdgeXrange))
-    edgeGroups = list()
-    for eg in [toTopEdge, toBotEdge, toWestEdge, toEastEdge]:
-        if len(eg) > 0:
-            edgeGroups.append(eg)
-    output = False
-    for edgeGroup in edgeGroups:
-        if areAllCoordsLessThan(grid_int, edgeGroup,
-                                grid_int[coordinate]):
-            output = True
-    return output
+    # check heights; the lines of trees to each edge are memoryview slices
+    treeHeight = grid_int.get(coordinate.y, coordinate.x)
+    row = grid_int.row(coordinate.y)
+    column = grid_int.column(coordinate.x)
+    for edgeGroup in [column[:coordinate.y], column[coordinate.y + 1:],
+                      row[:coordinate.x], row[coordinate.x + 1:]]:
+        if max(edgeGroup) < treeHeight:
+            return True
+    return False
 
 
 def makeGridOfVisible(grid_int: Grid_int) -> [int]:
@@ -240,7 +144,43 @@ an edge."""
     return flattened
 
 
-def prettyPrintColor(grid_int: Grid_int):
+def gridAsNumpy(grid_int: Grid_int) -> "numpy.ndarray":
+    '''A height × width numpy view of grid_int's values.  Shares memory
+with grid_int.grid when that is an array.array, whose typecode sets the
+dtype, so the 'q' scenic scores come out as int64.'''
+    flat = numpy.asarray(grid_int.grid)
+    return flat.reshape(grid_int.height, grid_int.width)
+
+
+def visibilityWithNumpy(heights: "numpy.ndarray") -> "numpy.ndarray":
+    '''Same 0/1/2 values as makeGridOfVisible, as a 2D numpy array.  A tree
+is visible from a side when it is taller than the running maximum of the
+trees before it on that side, so one numpy.maximum.accumulate per side
+finds them all in O(N²).'''
+    # heights are 0-9, and a quarter of the bytes is a quarter of the time
+    heights = heights.astype(numpy.int8)
+    visible = numpy.zeros(heights.shape, dtype=bool)
+    for axis in (0, 1):
+        for flip in (False, True):
+            # views, so from the east/south writes land in visible itself
+            lookingIn = numpy.flip(heights, axis) if flip else heights
+            visibleFrom = numpy.flip(visible, axis) if flip else visible
+            tallestSoFar = numpy.maximum.accumulate(lookingIn, axis=axis)
+            # taller than the tallest tree before it; edges are handled below
+            if axis == 1:
+                visibleFrom[:, 1:] |= lookingIn[:, 1:] > tallestSoFar[:, :-1]
+            else:
+                visibleFrom[1:, :] |= lookingIn[1:, :] > tallestSoFar[:-1, :]
+    output = visible.astype(numpy.intc)
+    # trees on the edge are always visible, and are 2
+    output[[0, -1], :] = 2
+    output[:, [0, -1]] = 2
+    return output
+
+
+def prettyColorString(grid_int: Grid_int) -> str:
+    '''The grid with its visible trees colored in by ANSI escapes, under x
+and y rulers, as one string for a terminal or log.'''
     # Escape Sequences
     fgWhite = "\u001B[38;5;7m"
     fgYellow = "\u001B[38;5;3m"
@@ -265,40 +205,40 @@ def prettyPrintColor(grid_int: Grid_int):
                 start = fgGreen
         return start + str(treeHeight) + end
 
-    print("---- TREE GRID   w: {0}   h: {1} ----"
-          .format(grid_int.width, grid_int.height))
+    lines = ["---- TREE GRID   w: {0}   h: {1} ----"
+             .format(grid_int.width, grid_int.height)]
 
     line1 = "{0}X→{1}            1    1    2    2    3{2}"\
         .format(fgCyan + bold, boldOff, fgOff)
     line2 = "{0}Y↓{1}  0    5    0    5    0    5    0{2}"\
         .format(fgCyan + bold, boldOff, fgOff)
     line3 = "  {0}┌────────────────────────────────{1}".format(fgCyan, fgOff)
-    for l in [line1, line2, line3]:
-        print(l)
+    lines.extend([line1, line2, line3])
 
     vGrid = makeGridOfVisible(grid_int)
 
-    lines = list()
     for y in range(0, grid_int.height):
-        line = ''
+        line = '{1}{0:<2}│{2} '.format(y, fgCyan, fgOff)
         for x in range (0, grid_int.width):
-            coord = Coordinate(y, x)
-            idx = grid_int._makeIndex(coord)
+            idx = grid_int.index(y, x)
             treeheight = grid_int[idx]
             visibility = vGrid[idx]
             output = format(treeheight, visibility)
             line += output
         lines.append(line)
 
-    for y in range(0, len(lines)):
-        print('{1}{0:<2}│{2}'.format(y, fgCyan, fgOff), lines[y])
-
-    if verbose:
+    if log.isEnabledFor(logging.DEBUG):
         for i in range(0, len(vGrid), grid_int.width):
             line = ''.join(map(lambda i: str(i),
                                vGrid[i : i + grid_int.width]))
-            print('   ', line)
-        print('↑----- vGrid -----↑')
+            log.debug('    %s', line)
+        log.debug('↑----- vGrid -----↑')
+
+    return '\n'.join(lines)
+
+
+def prettyPrintColor(grid_int: Grid_int):
+    print(prettyColorString(grid_int))
 
 
 def parse(input: str) -> Grid_int:
@@ -329,6 +269,22 @@ def parse(input: str) -> Grid_int:
     return Grid_int(height, width, flattenTrees)
 
 
+def parseWithNumpy(input: str) -> Grid_int:
+    '''parse(), but converting every digit in one numpy operation; needs
+numpy.'''
+    splitByLine = input.splitlines()
+    width = len(splitByLine[0])
+    assert all(len(line) == width for line in splitByLine), \
+        "lines are not all {0} trees wide".format(width)
+    digits = numpy.frombuffer(''.join(splitByLine).encode("ascii"),
+                              dtype=numpy.uint8) - ord('0')
+    # anything but 0-9 wrapped around to more than 9
+    assert digits.size == 0 or digits.max() <= 9, "trees must be 0-9 high"
+    flattenTrees = array.array('i')
+    flattenTrees.frombytes(digits.astype(numpy.intc).tobytes())
+    return Grid_int(len(splitByLine), width, flattenTrees)
+
+
 def pprintList(alist) -> str:
     listToStrings = list(map(lambda x: str(x), alist))
     output = '[' + ', '.join(listToStrings) + ']'
@@ -336,32 +292,35 @@ def pprintList(alist) -> str:
 
 def calculateScenicScoreOfTreeAt(trees: Grid_int, treeCoord: Coordinate) -> int:
 
+    tracing = log.isEnabledFor(logging.DEBUG)
+
     class CoordGeneration:
         '''Generates coordinates going away from the startingCoord in the indicated Direction.
 Stops when coord goes beyound bounds of trees.'''
 
         def __init__(self, startingCoord: Coordinate, direction: Direction):
-            self.currentCoord = startingCoord
+            # += moves currentCoord in place, so it mustn't be the caller's
+            self.currentCoord = startingCoord.copy()
             self.direction = direction
-            # if verbose:
-            #     print("New Instance of CoordGeneration Made.  startingCoord:{0}, direction:{1}"
+            self.transform = Direction.neighborTransform(direction)
+            # if tracing:
+            #     log.debug("New Instance of CoordGeneration Made.  startingCoord:{0}, direction:{1}"
             #           .format(startingCoord, direction))
 
         def __next__(self):
             # self.currentCord = self.currentCoord + self.direction.neighborTransform()
             # self.currentCoord += self.direction.neighborTransform()
-            transform = Direction.neighborTransform(self.direction)
-            if verbose:
-                # print("__next__ transform:", transform, "    type:", type(transform))
-                print("self.currentCoord:", self.currentCoord, end=' ❙ ')
-            self.currentCoord += transform
-            if verbose:
-                print("self.currentCoord:", self.currentCoord, "◀◀◀◀ after mutation")
+            previousCoord = self.currentCoord.copy() if tracing else None
+            self.currentCoord += self.transform
+            if tracing:
+                # log.debug("__next__ transform: %s    type: %s", transform, type(transform))
+                log.debug("self.currentCoord: %s ❙ self.currentCoord: %s ◀◀◀◀ after mutation",
+                          previousCoord, self.currentCoord)
             if trees.isCoordInBounds(self.currentCoord):
                 return self.currentCoord
             else:
-                if verbose:
-                    print("💣StopIteration raised.")
+                if tracing:
+                    log.debug("💣StopIteration raised.")
                 raise StopIteration()
 
         def __iter__(self):
@@ -374,35 +333,35 @@ Stops when coord goes beyound bounds of trees.'''
 
     treeHeight = trees[treeCoord]
 
-    if verbose:
-        print("✯✯✯✯✯✯ calculateScenicScoreOfTreeAt coord:{0}   which has height: {1}  ✯✯✯✯✯✯"
-              .format(treeCoord, treeHeight))
+    if tracing:
+        log.debug("✯✯✯✯✯✯ calculateScenicScoreOfTreeAt coord:%s   which has height: %d  ✯✯✯✯✯✯",
+                  treeCoord, treeHeight)
 
     scoreMapping = dict()
     for direction in list(Direction):
         treeCount = 0
         generator = iter(CoordGeneration(treeCoord, direction))
-        if verbose:
-            print("    Direction: {0} --- treeCoord: {1}".format(str(direction), treeCoord))
+        if tracing:
+            log.debug("    Direction: %s --- treeCoord: %s", direction, treeCoord)
         try:
             while True:
                 nextCoord = next(generator)
                 treeCount += 1
                 nextHeight = trees[nextCoord]
-                if verbose:
-                    print("        nextCoord:{0}   nextHeight:{1} treeCount:{2}"
-                          .format(nextCoord, nextHeight, treeCount))
+                if tracing:
+                    log.debug("        nextCoord:%s   nextHeight:%d treeCount:%d",
+                              nextCoord, nextHeight, treeCount)
                 if nextHeight >= treeHeight:
                     raise BigTreeFound(nextCoord, nextHeight)
         except (StopIteration, BigTreeFound):
             scoreMapping[direction] = treeCount
-            if verbose:
-                print("    end of direction {0} ---".format(str(direction)))
+            if tracing:
+                log.debug("    end of direction %s ---", direction)
 
-    if verbose:
-        #print("    calculateScoreOfTreeAt:", treeCoord, "  it's height:", treeHeight)
+    if tracing:
+        #log.debug("    calculateScoreOfTreeAt: %s  it's height: %d", treeCoord, treeHeight)
         for d in list(Direction):
-            print("    {0}: {1}".format(str(d), str(scoreMapping[d])))
+            log.debug("    %s: %d", d, scoreMapping[d])
 
     # Mistake! Don't remove zero
     # values = filter(lambda n: n > 0, scoreMapping.values())
@@ -412,14 +371,56 @@ Stops when coord goes beyound bounds of trees.'''
     return reduction
                 
 
+def multiplyViewingDistances(heights, scores, indices):
+    '''For each tree at indices (a line of trees, in order), multiply its
+score by how many trees it sees looking back toward indices[0].  stack
+holds the trees that could still block a view, tallest at the bottom; each
+tree is pushed and popped at most once, so a line costs O(len(indices)).'''
+    stack = list()          # positions into indices
+    stackHeights = list()   # the heights of the trees in stack
+    for position, index in enumerate(indices):
+        height = heights[index]
+        while stackHeights and stackHeights[-1] < height:
+            stack.pop()
+            stackHeights.pop()
+        if stack:
+            scores[index] *= position - stack[-1]
+        else:
+            scores[index] *= position     # sees all the way to the edge
+        stack.append(position)
+        stackHeights.append(height)
+
+
+def calculateScenicScores(trees: Grid_int) -> Grid_int:
+    '''calculateScenicScoreOfTreeAt for every tree at once, in O(N²): one
+monotonic stack pass per row and column in each direction.'''
+    width = trees.width
+    size = len(trees.grid)
+    # four distances multiplied overflow 32 bits past about 430 trees a side
+    scores = array.array('q', [1]) * size
+    for y in range(0, trees.height):
+        row = range(y * width, (y + 1) * width)
+        multiplyViewingDistances(trees.grid, scores, row)          # west
+        multiplyViewingDistances(trees.grid, scores, row[::-1])    # east
+    for x in range(0, width):
+        column = range(x, size, width)
+        multiplyViewingDistances(trees.grid, scores, column)       # north
+        multiplyViewingDistances(trees.grid, scores, column[::-1]) # south
+    return Grid_int(trees.height, trees.width, scores)
+
+
 def solve(input: str, part=1) -> int:
-    treeGrid = parse(input)
+    if numpy is not None:
+        treeGrid = parseWithNumpy(input)
+    else:
+        treeGrid = parse(input)
 
     if part == 1:
-        if verbose:
-            print()
-            prettyPrintColor(treeGrid)
-            print("---------------")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("\n%s\n---------------", prettyColorString(treeGrid))
+        if numpy is not None:
+            visible = visibilityWithNumpy(gridAsNumpy(treeGrid))
+            return int(numpy.count_nonzero(visible))
         gridOfVisible = makeGridOfVisible(treeGrid)
         visibleCount = 0
         for v in gridOfVisible:
@@ -427,19 +428,16 @@ def solve(input: str, part=1) -> int:
                 visibleCount += 1
         return visibleCount
     elif part == 2:
-        scoresMap = map(lambda c: calculateScenicScoreOfTreeAt(treeGrid, c),
-                     treeGrid.allCoordinates())
-        scores = array.array('i')
-        scores.fromlist(list(scoresMap))
-        scoreGrid = Grid_int(treeGrid.height, treeGrid.width, scores)
-        print("----- scoreGrid: ------")
-        print(str(scoreGrid))
+        scoreGrid = calculateScenicScores(treeGrid)
+        log.debug("----- scoreGrid: ------\n%s", scoreGrid)
         solution = max(scoreGrid.grid)
         return solution
 
 
-# TODO: fill in example solution
-# run(InputProvider.EXAMPLE, part=1, expectedSolution=21)
-# run(InputProvider.INPUTFILE, part=1)
-run(InputProvider.EXAMPLE, part=2, expectedSolution=8)
-run(InputProvider.INPUTFILE, part=2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    # TODO: fill in example solution
+    # run(InputProvider.EXAMPLE, part=1, expectedSolution=21)
+    # run(InputProvider.INPUTFILE, part=1)
+    run(InputProvider.EXAMPLE, part=2, expectedSolution=8)
+    run(InputProvider.INPUTFILE, part=2)
@@ -1,9 +1,18 @@
 # Advent of Code
 
 from enum import Enum, auto
+import logging
+import os
+import tracemalloc
 
-# global variable to make functions more chatty for debugging
-verbose = True
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day09")
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
@@ -38,8 +47,8 @@ L 25
 U 20
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
 
 
 def run(inputProvider, part=1, expectedSolution=()):
@@ -47,7 +56,8 @@ def run(inputProvider, part=1, expectedSolution=()):
     if (part < 1) or (part > 2):
         raise ValueError("parameter 'part' must be a one or two.")
     finishChar = "🏁"
-    solutionUnderTest = solvePart1(inputProvider.getInput())
+    solver = solvePart1 if part == 1 else solvePart2
+    solutionUnderTest = solver(inputProvider.getInput())
     if expectedSolution != ():
         if expectedSolution == solutionUnderTest:
             finishChar = "✅"
@@ -57,90 +67,12 @@ def run(inputProvider, part=1, expectedSolution=()):
           "  expected:", str(expectedSolution), "\n")
 
 
-
-class Distance:
-
-    def __init__(self, dy: int, dx: int):
-        self.dy = dy
-        self.dx = dx
-
-    def __eq__(self, other) -> bool:
-        if self.dy == other.dy:
-            return self.dx == other.dx
-        else:
-            return False
-
-    def __ne__(self, other) -> bool:
-        if self.dy != other.dy:
-            return True
-        else:
-            return self.dx != other.dx
-
-    def __str__(self) -> str:
-        return '↕{0},↔{1}'.format(self.dy, self.dx)
-
-    @classmethod
-    def makeZero(cls):
-        return Distance(0, 0)
-
-
-class Coordinate:
-
-    def __init__(self, y: int, x: int):
-        self.y = y
-        self.x = x
-
-    def __eq__(self, other) -> bool:
-        if self.y == other.y:
-            return self.x == other.x
-        else:
-            return False
-
-    def __ne__(self, other) -> bool:
-        if self.y != self.y:
-            return True
-        else:
-            return self.x != other.x
-
-    def __str__(self) -> str:
-        return "✦(y:{0},x:{1})".format(self.y, self.x)
-
-    def __hash__(self):
-        return hash((self.y, self.x))
-
-    def move(self, distance: Distance):
-        self.y += distance.dy
-        self.x += distance.dx
-
-    def distanceTo(self, other) -> Distance:
-        return Distance(other.y - self.y,
-                        other.x - self.x)
-
-    @classmethod
-    def makeZero(cls):
-        return Coordinate(0, 0)
-
-
 class Movement:
 
     def __init__(self, direction: str, count: int):
         self.direction = direction
         self.count = count
 
-    def neighborTransform(self) -> Distance:
-        match self.direction:
-            case 'U':
-                return Distance(1, 0)
-            case 'D':
-                return Distance(-1, 0)
-            case 'L':
-                return Distance(0, -1)
-            case 'R':
-                return Distance(0, 1)
-            case _:
-                raise Exception("Unreachable.  direction: {0}"
-                                .format(self.direction))
-
     @classmethod
     def makeMovement(cls, line: str):
         splitBySpace = line.split()
@@ -151,48 +83,325 @@ class Movement:
         return Movement(direction, count)
 
 
-def updateTail(head, tail) -> Distance:
-    distance = tail.distanceTo(head)
-    if abs(distance.dy) < 2 and abs(distance.dx) < 2:
-        return Distance.makeZero()
-    newDy = 0
-    newDx = 0
-    if distance.dy > 0:
-        newDy = 1
-    if distance.dy < 0:
-        newDy = -1
-    if distance.dx > 0:
-        newDx = 1
-    if distance.dx < 0:
-        newDx = -1
-    return Distance(newDy, newDx)
+# the (dy, dx) of one step of the head
+STEPS = {'U': (1, 0), 'D': (-1, 0), 'L': (0, -1), 'R': (0, 1)}
 
+# visited cells are recorded as the int y * KEY_STRIDE + x, which is unique
+# while |x| < KEY_STRIDE / 2, and can't change once it's in a set
+KEY_STRIDE = 1 << 32
 
-def solvePart1(input: str) -> int:
-    head = Coordinate.makeZero()
-    tail = Coordinate.makeZero()
-    tailVisits = {Coordinate.makeZero()}
-
-    for line in input.splitlines():
-        movement = Movement.makeMovement(line)
-        neighborTransform = movement.neighborTransform()
-        distanceRemaining = movement.count
-        while distanceRemaining > 0:
-            head.move(neighborTransform)
-            tailMove = updateTail(head, tail)
-            if tailMove != Distance.makeZero():
-                tail.move(tailMove)
-                tailVisits.add(tail)
-            if verbose:
-                print('H:{0: >2},{1: >2}  T:{2: >2},{3: >2}'\
-                      .format(head.y, head.x, tail.y, tail.x))
-            distanceRemaining -= 1
+
+def packKey(y: int, x: int) -> int:
+    return y * KEY_STRIDE + x
+
+
+def parseMovements(input: str) -> [Movement]:
+    return [Movement.makeMovement(line) for line in input.splitlines()]
+
+
+def isStraight(ys: [int], xs: [int], dy: int, dx: int) -> bool:
+    '''Whether every knot is one (dy, dx) step behind the one before it,
+so that from now on the whole rope moves with the head.'''
+    for k in range(1, len(ys)):
+        if ys[k - 1] - ys[k] != dy or xs[k - 1] - xs[k] != dx:
+            return False
+    return True
+
+
+def fastForward(ys: [int], xs: [int], dy: int, dx: int, steps: int):
+    '''Moves a straight rope steps (dy, dx) steps in one go.'''
+    for k in range(len(ys)):
+        ys[k] += dy * steps
+        xs[k] += dx * steps
+
+
+def lineOfKeys(y: int, x: int, dy: int, dx: int, steps: int) -> range:
+    '''The packed keys of the steps cells after (y, x) going (dy, dx), as a
+range, since one step always adds the same amount to a key.'''
+    key = y * KEY_STRIDE + x
+    stepKey = dy * KEY_STRIDE + dx
+    return range(key + stepKey, key + stepKey * (steps + 1), stepKey)
+
+
+class VisitedSet:
+    '''Visited cells as packed int keys in a set; small for sparse walks,
+but a set entry costs far more than the cell it records.'''
+
+    def __init__(self):
+        self.keys = set()
+
+    def add(self, y: int, x: int):
+        self.keys.add(y * KEY_STRIDE + x)
+
+    def addLine(self, y: int, x: int, dy: int, dx: int, steps: int):
+        '''The steps cells after (y, x) going (dy, dx).'''
+        self.keys.update(lineOfKeys(y, x, dy, dx, steps))
+
+    def __contains__(self, cell: (int, int)) -> bool:
+        return packKey(*cell) in self.keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class VisitedBitmap:
+    '''Visited cells as one bit each in a bytearray covering a box around
+them, rows of rowBytes bytes from y = top down and x = left across.  When a
+cell lands outside the box, the box at least doubles along that axis with
+the old one in its middle.  A bit per cell of the box is tiny for walks that cover their
+area densely, but a few long strides far apart make a big, mostly empty
+box, and a VisitedSet does better there.'''
+
+    # SET_BIT[bit] maps a byte to itself with that bit set, for bytes.translate
+    SET_BIT = [bytes(value | (1 << bit) for value in range(256))
+               for bit in range(8)]
+
+    def __init__(self, height: int = 64, width: int = 64):
+        self.height = height
+        self.rowBytes = (width + 7) // 8
+        self.top = -(height // 2)
+        self.left = -8 * (self.rowBytes // 2)
+        self.bits = bytearray(self.height * self.rowBytes)
+
+    def _fit(self, lowY: int, highY: int, lowX: int, highX: int):
+        '''Grows the box, if need be, to hold lowY..highY × lowX..highX.
+Only an axis that overflows grows; the other keeps its place and size, so
+a walk along one row stays one box high.'''
+        width = 8 * self.rowBytes
+        fitsY = self.top <= lowY and highY < self.top + self.height
+        fitsX = self.left <= lowX and highX < self.left + width
+        if fitsY and fitsX:
+            return
+        height = self.height
+        top = self.top
+        if not fitsY:
+            lowY = min(lowY, self.top)
+            highY = max(highY, self.top + self.height - 1)
+            height = max(2 * self.height, highY - lowY + 1)
+            top = lowY - (height - (highY - lowY + 1)) // 2
+        rowBytes = self.rowBytes
+        left = self.left
+        if not fitsX:
+            lowX = min(lowX, self.left)
+            highX = max(highX, self.left + width - 1)
+            width = max(2 * width, highX - lowX + 1)
+            left = lowX - (width - (highX - lowX + 1)) // 2
+            # whole bytes of shift, so old rows are copied rather than re-packed
+            left -= (left - self.left) % 8
+            rowBytes = (max(highX + 1, left + width) - left + 7) // 8
+        bits = bytearray(height * rowBytes)
+        # where the old box's first byte goes in the new one
+        shift = (self.top - top) * rowBytes + (self.left - left) // 8
+        for row in range(self.height):
+            old = row * self.rowBytes
+            new = shift + row * rowBytes
+            bits[new : new + self.rowBytes] = self.bits[old : old + self.rowBytes]
+        self.height = height
+        self.rowBytes = rowBytes
+        self.top = top
+        self.left = left
+        self.bits = bits
+
+    def add(self, y: int, x: int):
+        row = y - self.top
+        column = x - self.left
+        if not (0 <= row < self.height and 0 <= column < 8 * self.rowBytes):
+            self._fit(y, y, x, x)
+            row = y - self.top
+            column = x - self.left
+        self.bits[row * self.rowBytes + (column >> 3)] |= 1 << (column & 7)
+
+    def addLine(self, y: int, x: int, dy: int, dx: int, steps: int):
+        '''The steps cells after (y, x) going (dy, dx), set a byte or a
+strided slice at a time rather than a cell at a time.'''
+        endY = y + dy * steps
+        endX = x + dx * steps
+        lowY, highY = min(y + dy, endY), max(y + dy, endY)
+        lowX, highX = min(x + dx, endX), max(x + dx, endX)
+        self._fit(lowY, highY, lowX, highX)
+        bits = self.bits
+        if dy == 0:
+            start = (lowY - self.top) * self.rowBytes
+            first = lowX - self.left
+            last = highX - self.left
+            if first >> 3 == last >> 3:
+                bits[start + (first >> 3)] |= \
+                    (0xFF << (first & 7)) & (0xFF >> (7 - (last & 7)))
+            else:
+                bits[start + (first >> 3)] |= (0xFF << (first & 7)) & 0xFF
+                bits[start + (first >> 3) + 1 : start + (last >> 3)] = \
+                    b'\xff' * ((last >> 3) - (first >> 3) - 1)
+                bits[start + (last >> 3)] |= 0xFF >> (7 - (last & 7))
+        elif dx == 0:
+            column = x - self.left
+            start = (lowY - self.top) * self.rowBytes + (column >> 3)
+            end = (highY - self.top) * self.rowBytes + (column >> 3) + 1
+            column = bits[start : end : self.rowBytes]
+            bits[start : end : self.rowBytes] = \
+                column.translate(VisitedBitmap.SET_BIT[(x - self.left) & 7])
+        else:
+            for step in range(1, steps + 1):
+                self.add(y + dy * step, x + dx * step)
+
+    def __contains__(self, cell: (int, int)) -> bool:
+        row = cell[0] - self.top
+        column = cell[1] - self.left
+        if not (0 <= row < self.height and 0 <= column < 8 * self.rowBytes):
+            return False
+        return bool(self.bits[row * self.rowBytes + (column >> 3)]
+                    & (1 << (column & 7)))
+
+    def __len__(self) -> int:
+        # a slice at a time, so the count never copies the whole box
+        view = memoryview(self.bits)
+        return sum(int.from_bytes(view[start : start + 4096], "little")
+                   .bit_count() for start in range(0, len(view), 4096))
+
+
+def simulateRope(movements: [Movement], knotCount: int,
+                 visitedType=VisitedSet) -> int:
+    '''How many cells the last of knotCount knots visits.  The knots are
+two flat lists of ints, ys and xs, head first, and each follows the one
+before it by the sign of the gap, so no step allocates anything but the
+packed key of a newly visited cell.  Once a knot doesn't move, none
+behind it do either.  Once the rope is straight along a long movement,
+the rest of it is done in one go, and the tail's cells added as a range,
+so the cost follows the number of turns rather than the distance.
+visitedType is VisitedSet or VisitedBitmap, whichever suits the walk.'''
+    if knotCount < 1:
+        raise ValueError("parameter 'knotCount' must be at least one.")
+    ys = [0] * knotCount
+    xs = [0] * knotCount
+    knots = range(1, knotCount)
+    tail = knotCount - 1
+    tailVisits = visitedType()
+    tailVisits.add(0, 0)
+    addTailVisit = tailVisits.add
+    tracing = log.isEnabledFor(logging.DEBUG)
+
+    for movement in movements:
+        dy, dx = STEPS[movement.direction]
+        remaining = movement.count
+        while remaining > 0:
+            if remaining > knotCount and isStraight(ys, xs, dy, dx):
+                tailVisits.addLine(ys[tail], xs[tail], dy, dx, remaining)
+                fastForward(ys, xs, dy, dx, remaining)
+                if tracing:
+                    log.debug('H:%2d,%2d  T:%2d,%2d  fast-forwarded %d',
+                              ys[0], xs[0], ys[tail], xs[tail], remaining)
+                break
+            ys[0] += dy
+            xs[0] += dx
+            for k in knots:
+                gapY = ys[k - 1] - ys[k]
+                gapX = xs[k - 1] - xs[k]
+                if -1 <= gapY <= 1 and -1 <= gapX <= 1:
+                    break
+                ys[k] += (gapY > 0) - (gapY < 0)
+                xs[k] += (gapX > 0) - (gapX < 0)
+            else:
+                # the tail moved
+                addTailVisit(ys[tail], xs[tail])
+            if tracing:
+                log.debug('H:%2d,%2d  T:%2d,%2d', ys[0], xs[0], ys[tail], xs[tail])
+            remaining -= 1
     return len(tailVisits)
 
 
-# TODO: fill in example solution
-run(InputProvider.EXAMPLE, part=1, expectedSolution=13)
-# run(InputProvider.INPUTFILE, part=1, expectedSolution=6018)
-# run(InputProvider.EXAMPLE, part=2, expectedSolution=1)
-# run(InputProvider.EXAMPLE2, part=2, expectedSolution=36)
-# run(InputProvider.INPUTFILE, part=2, expectedSolution=2619)
+def simulateAllRopeLengths(movements: [Movement], knotCount: int,
+                           visitedType=VisitedSet) -> dict:
+    '''simulateRope() for every rope of 2 to knotCount knots, from one pass:
+knot k only ever follows knot k - 1, so it moves the same way whether or
+not there are more knots behind it.  Returns {knots in the rope: cells its
+tail visits}.'''
+    if knotCount < 2:
+        raise ValueError("parameter 'knotCount' must be at least two.")
+    ys = [0] * knotCount
+    xs = [0] * knotCount
+    knots = range(1, knotCount)
+    # knotVisits[k] is every cell knot k has been on; knot 0's is not kept
+    knotVisits = [visitedType() for _ in range(knotCount)]
+    for visits in knotVisits:
+        visits.add(0, 0)
+
+    for movement in movements:
+        dy, dx = STEPS[movement.direction]
+        remaining = movement.count
+        while remaining > 0:
+            if remaining > knotCount and isStraight(ys, xs, dy, dx):
+                for k in knots:
+                    knotVisits[k].addLine(ys[k], xs[k], dy, dx, remaining)
+                fastForward(ys, xs, dy, dx, remaining)
+                break
+            ys[0] += dy
+            xs[0] += dx
+            for k in knots:
+                gapY = ys[k - 1] - ys[k]
+                gapX = xs[k - 1] - xs[k]
+                if -1 <= gapY <= 1 and -1 <= gapX <= 1:
+                    break
+                ys[k] += (gapY > 0) - (gapY < 0)
+                xs[k] += (gapX > 0) - (gapX < 0)
+                knotVisits[k].add(ys[k], xs[k])
+            remaining -= 1
+    return {k + 1: len(knotVisits[k]) for k in knots}
+
+
+def solvePart1(input: str) -> int:
+    return simulateRope(parseMovements(input), 2)
+
+
+def solvePart2(input: str) -> int:
+    return simulateRope(parseMovements(input), 10)
+
+
+def peakMemory(movements: [Movement], knotCount: int, visitedType) -> (int, int):
+    '''(cells the tail visits, peak bytes allocated while simulating).'''
+    tracemalloc.start()
+    try:
+        visited = simulateRope(movements, knotCount, visitedType)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (visited, peak)
+
+
+def runMemoryCheck(cycles: int = 20000):
+    '''A 2-knot up, right, down, right zigzag only spreads along one row,
+so the bitmap has to stay smaller than the set.'''
+    movements = [Movement(direction, 1) for direction in "URDR"] * cycles
+    print("Comparing visited-cell memory on a", 4 * cycles, "move zigzag")
+    setVisits, setPeak = peakMemory(movements, 2, VisitedSet)
+    bitmapVisits, bitmapPeak = peakMemory(movements, 2, VisitedBitmap)
+    finishChar = "✅" if setVisits == bitmapVisits and bitmapPeak < setPeak \
+        else "❌"
+    print(finishChar, "VisitedSet:", setVisits, "cells,", setPeak, "bytes",
+          "  VisitedBitmap:", bitmapVisits, "cells,", bitmapPeak, "bytes\n")
+
+
+def runAllRopeLengths(inputProvider, knotCount: int, expectedSolutions: dict):
+    '''simulateAllRopeLengths(), checked against expectedSolutions, {knots
+in the rope: cells its tail visits}, which solvePart1 and solvePart2 give
+for 2 and 10 knots.'''
+    print("Solving every rope up to", knotCount, "knots for", inputProvider)
+    solutions = simulateAllRopeLengths(
+        parseMovements(inputProvider.getInput()), knotCount)
+    for knots, expectedSolution in expectedSolutions.items():
+        finishChar = "✅" if solutions[knots] == expectedSolution else "❌"
+        print(finishChar, knots, "knots:", solutions[knots],
+              "  expected:", expectedSolution)
+    print()
+
+
+if __name__ == "__main__":
+    # before logging is configured, so the long walk isn't traced
+    runMemoryCheck()
+    logging.basicConfig(format="%(message)s", level=logging.DEBUG)
+    # TODO: fill in example solution
+    run(InputProvider.EXAMPLE, part=1, expectedSolution=13)
+    run(InputProvider.INPUTFILE, part=1, expectedSolution=6018)
+    run(InputProvider.EXAMPLE, part=2, expectedSolution=1)
+    run(InputProvider.EXAMPLE2, part=2, expectedSolution=36)
+    run(InputProvider.INPUTFILE, part=2, expectedSolution=2619)
+    runAllRopeLengths(InputProvider.EXAMPLE2, 10, {2: 88, 10: 36})
+    runAllRopeLengths(InputProvider.INPUTFILE, 10, {2: 6018, 10: 2619})
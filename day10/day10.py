@@ -3,16 +3,36 @@
 from enum import Enum, auto
 from functools import reduce
 from itertools import repeat
+import logging
+import os
+import sys
 
-# global variable to make functions more chatty for debugging
-verbose = False
+
+# the input readers live in the advent2022 package at the top of the
+# repository, which isn't on sys.path when this file is run on its own
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+    sys.path.append(repoRoot)
+from advent2022.mapped import mappedLines
+
+
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day10")
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
     """The function getInput() is the star here, giving you the input string to
-    work with."""
+    work with.  MAPPEDFILE gives an iterator over the lines of input.txt
+    instead, for inputs too big to hold in memory."""
     EXAMPLE = auto()
     INPUTFILE = auto()
+    MAPPEDFILE = auto()
 
     def getInput(self) -> str:
         match self:
@@ -166,8 +186,10 @@ noop
 noop
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
+            case InputProvider.MAPPEDFILE:
+                return mappedLines(inputFilePath)
 
 
 def run(inputProvider, part=1, expectedSolution=()):
@@ -193,19 +215,24 @@ def isInterestingCycle(n: int) -> bool:
 
 
 def solvePart1(input) -> int:
-    splitByLine = input.splitlines()
+    '''input is the whole str, or an iterator of its lines (MAPPEDFILE).
+Instructions are read one at a time, and only as far as cycle 220.'''
+    splitByLine = input
+    if isinstance(input, str):
+        splitByLine = input.splitlines()
+    instructions = iter(splitByLine)
     regX = 1
     cycleCount = 0
     LAST_CYCLE = 220
-    instructionInputIndex = 0
     instructionCycleCount = 0
     instructionCyclesRequired = 1
     signalStrengths = list()
     instruction = lambda n: n
-    if splitByLine[0] == "noop":
+    firstInstructionString = next(instructions)
+    if firstInstructionString == "noop":
         pass
-    elif splitByLine[0].startswith("addx"):
-        parameter = int(splitByLine[0][5:])
+    elif firstInstructionString.startswith("addx"):
+        parameter = int(firstInstructionString[5:])
         instruction = lambda n: n + parameter
         instructionCyclesRequired = 2
     while cycleCount < LAST_CYCLE:
@@ -213,15 +240,14 @@ def solvePart1(input) -> int:
         instructionCycleCount += 1
         if isInterestingCycle(cycleCount):
             signalStrengths.append(cycleCount * regX)
-            if verbose:
-                print("Cycle:", cycleCount)
-                print("signalStrengths:", signalStrengths)
+            log.debug("Cycle: %d", cycleCount)
+            log.debug("signalStrengths: %s", signalStrengths)
         if instructionCycleCount >= instructionCyclesRequired:
             # apply instruction
             regX = instruction(regX)
             instructionCycleCount = 0
-            instructionInputIndex += 1
-            newInstructionString = splitByLine[instructionInputIndex]
+            # a program that ends early leaves the CPU idling
+            newInstructionString = next(instructions, "noop")
             if newInstructionString == "noop":
                 instruction = lambda n: n
                 instructionCyclesRequired = 1
@@ -229,6 +255,9 @@ def solvePart1(input) -> int:
                 parameter = int(newInstructionString[5:])
                 instruction = lambda n: n + parameter
                 instructionCyclesRequired = 2
+    # don't wait for garbage collection to close a MAPPEDFILE's input.txt
+    if hasattr(instructions, "close"):
+        instructions.close()
     output = reduce(lambda l, r: l + r, signalStrengths)
     return output
 
@@ -272,15 +301,19 @@ class Display:
             self.data[cycle0] = True
 
 
-def solvePart2(input: str) -> str:
-    splitByLine = input.splitlines()
+def solvePart2(input) -> str:
+    '''input is the whole str, or an iterator of its lines (MAPPEDFILE).'''
+    splitByLine = input
+    if isinstance(input, str):
+        splitByLine = input.splitlines()
+    instructions = iter(splitByLine)
     cycleCount = 0
     regX = 1
     display = Display()
     instCycleCount = 0
-    instStr = splitByLine[0]
+    instStr = next(instructions)
     instCyclesNeeded = 1
-    instruction: lambda n: n
+    instruction = lambda n: n
     if instStr == "noop":
         pass
     elif instStr.startswith("addx"):
@@ -288,7 +321,6 @@ def solvePart2(input: str) -> str:
         instruction = lambda n: n + parameter
         instCyclesNeeded = 2
     LAST_CYCLE = 240
-    instIndex = 1
     while (cycleCount < LAST_CYCLE) and (instStr != "HALT"):
         cycleCount += 1
         instCycleCount += 1
@@ -300,10 +332,7 @@ def solvePart2(input: str) -> str:
         if instCycleCount >= instCyclesNeeded:
             regX = instruction(regX)
             instCycleCount = 0
-            if instIndex < len(splitByLine):
-                instStr = splitByLine[instIndex]
-            else:
-                instStr = "HALT"
+            instStr = next(instructions, "HALT")
             if instStr == "noop":
                 instCyclesNeeded = 1
                 instruction = lambda n: n
@@ -311,16 +340,19 @@ def solvePart2(input: str) -> str:
                 parameter = int(instStr[5:])
                 instCyclesNeeded = 2
                 instruction = lambda n: n + parameter
-            instIndex += 1
+    # don't wait for garbage collection to close a MAPPEDFILE's input.txt
+    if hasattr(instructions, "close"):
+        instructions.close()
     # output = display.strView()
     output = display.betterStrView()
-    print('-------   output  -------')
-    print(output)
+    log.info('-------   output  -------\n%s', output)
     return output
 
 
-# TODO: fill in example solution
-run(InputProvider.EXAMPLE, part=1, expectedSolution=13140)
-run(InputProvider.INPUTFILE, part=1, expectedSolution=13480)
-# run(InputProvider.EXAMPLE, part=2)
-run(InputProvider.INPUTFILE, part=2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    # TODO: fill in example solution
+    run(InputProvider.EXAMPLE, part=1, expectedSolution=13140)
+    run(InputProvider.INPUTFILE, part=1, expectedSolution=13480)
+    # run(InputProvider.EXAMPLE, part=2)
+    run(InputProvider.INPUTFILE, part=2)
@@ -2,9 +2,17 @@
 
 from enum import Enum, auto
 import re
+import logging
+import os
 
-# global variable to make functions more chatty for debugging
-verbose = True
+# tracing goes through this logger; it stays quiet unless logging is
+# configured, as running this file or `python -m advent2022` does
+log = logging.getLogger("advent2022.day11")
+
+
+# input.txt sits next to this file, so it is found from any working directory
+inputFilePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "input.txt")
 
 
 class InputProvider(Enum):
@@ -46,8 +54,8 @@ Monkey 3:
     If false: throw to monkey 1
 """
             case InputProvider.INPUTFILE:
-                inputFile = open("input.txt", mode="rt")
-                return inputFile.read()
+                with open(inputFilePath, mode="rt") as inputFile:
+                    return inputFile.read()
 
 
 def run(inputProvider, part=1, expectedSolution=()):
@@ -113,8 +121,10 @@ def solve(input, part=1) -> int:
     pass
 
 
-# TODO: fill in example solution
-run(InputProvider.EXAMPLE, part=1, expectedSolution=10605)
-run(InputProvider.INPUTFILE, part=1, expectedSolution=95472)
-# run(InputProvider.EXAMPLE, part=2, expectedSolution=)
-# run(InputProvider.INPUTFILE, part=2)
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.DEBUG)
+    # TODO: fill in example solution
+    run(InputProvider.EXAMPLE, part=1, expectedSolution=10605)
+    run(InputProvider.INPUTFILE, part=1, expectedSolution=95472)
+    # run(InputProvider.EXAMPLE, part=2, expectedSolution=)
+    # run(InputProvider.INPUTFILE, part=2)